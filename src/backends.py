@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# backends.py
+#
+# Description:
+# Detector inference backends for CPU-only edge boxes. The YOLO plate detector
+# can run through:
+#   - "torch":    the Ultralytics model loaded from the .pt file (original behaviour).
+#   - "onnx":     a lean ONNX Runtime session with our own letterbox, decoding and NMS.
+#   - "openvino": the Ultralytics OpenVINO export, run through Ultralytics' own runtime.
+#
+# Exports are created once from the .pt weights and cached next to them, one per
+# image size (e.g. licence_plate_model_200epoch_640.onnx); they are only rebuilt
+# when the .pt file is newer than the export. Ultralytics is only imported for the
+# torch and openvino backends and for exporting, so running an existing .onnx
+# file only needs ONNX Runtime.
+#
+# How to Run (export + equivalence check against the torch model):
+#   python backends.py --backend onnx --check ../dataset/test/images
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+# --- Third-Party Library Imports ---
+import cv2
+import numpy as np
+
+# --- Local Module Imports ---
+from batching import EMPTY_DETECTIONS, Detections, run_detector
+from tracker import box_iou
+
+# --- Constants ---
+BACKENDS = ("torch", "onnx", "openvino")
+REPO_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_WEIGHTS = REPO_DIR / "models" / "trained_model" / "licence_plate_model_200epoch.pt"
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def export_path(weights: Path, backend: str, imgsz: int) -> Path:
+    """Returns where the cached export of `weights` for a backend and image size lives."""
+    if backend == "onnx":
+        return weights.parent / f"{weights.stem}_{imgsz}.onnx"
+    if backend == "openvino":
+        return weights.parent / f"{weights.stem}_{imgsz}_openvino_model"
+    raise ValueError(f"Backend '{backend}' has no export format.")
+
+
+def export_detector(weights: str | Path, backend: str, imgsz: int = 640) -> Path:
+    """
+    Exports the YOLO weights for a backend, reusing a cached export if it is up to date.
+
+    Args:
+        weights (str | Path): Path to the .pt weights.
+        backend (str): "onnx" or "openvino".
+        imgsz (int): Inference image size baked into the export.
+
+    Returns:
+        Path: The exported model file (ONNX) or directory (OpenVINO).
+    """
+    weights = Path(weights)
+    target = export_path(weights, backend, imgsz)
+    if target.exists() and target.stat().st_mtime >= weights.stat().st_mtime:
+        return target
+
+    from ultralytics import YOLO
+    print(f"Exporting {weights.name} to {backend} (imgsz={imgsz})...")
+    # A dynamic batch axis lets the ONNX session take whole frame batches.
+    exported = Path(YOLO(str(weights)).export(format=backend, imgsz=imgsz, dynamic=backend == "onnx"))
+    # Ultralytics always writes to the same name; move it to the size-specific cache name.
+    if target.is_dir():
+        shutil.rmtree(target)
+    exported.replace(target)
+    return target
+
+
+def letterbox(image: np.ndarray, size: int) -> tuple[np.ndarray, float, tuple[float, float]]:
+    """
+    Resizes an image to a `size` x `size` square, keeping its aspect ratio and
+    padding the borders with grey, as done by Ultralytics.
+
+    Returns:
+        tuple[np.ndarray, float, tuple[float, float]]: The padded image, the resize
+        ratio, and the (x, y) padding added on the left and top.
+    """
+    h, w = image.shape[:2]
+    ratio = min(size / h, size / w)
+    new_w, new_h = round(w * ratio), round(h * ratio)
+    pad_x, pad_y = (size - new_w) / 2, (size - new_h) / 2
+    if (new_w, new_h) != (w, h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, bottom = round(pad_y - 0.1), round(pad_y + 0.1)
+    left, right = round(pad_x - 0.1), round(pad_x + 0.1)
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+    return image, ratio, (left, top)
+
+
+class OnnxDetector:
+    """
+    Runs an exported YOLO detection model through a plain ONNX Runtime session.
+    Exposes `detect(frames, conf)`, which returns one `Detections` per frame.
+    """
+
+    def __init__(self, onnx_path: str | Path, imgsz: int = 640, iou: float = 0.7, threads: int = 0):
+        """
+        Args:
+            onnx_path (str | Path): Path to the exported .onnx model.
+            imgsz (int): Input size, used when the model has a dynamic spatial shape.
+            iou (float): IoU threshold for non-maximum suppression.
+            threads (int): ONNX Runtime intra-op threads (0 lets ONNX Runtime decide).
+        """
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(str(onnx_path), options, providers=["CPUExecutionProvider"])
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        batch, _, height, _ = model_input.shape
+        self.imgsz = height if isinstance(height, int) else imgsz
+        self.dynamic_batch = not isinstance(batch, int)
+        self.input_dtype = np.float16 if "float16" in model_input.type else np.float32
+        self.iou = iou
+
+    def detect(self, frames: list[np.ndarray], conf: float, classes: list[int] | None = None) -> list[Detections]:
+        """
+        Detects plates in a list of BGR frames.
+
+        Args:
+            frames (list[np.ndarray]): The frames to process.
+            conf (float): Detection confidence threshold.
+            classes (list[int] | None): Only keep predictions of these class indices (None keeps all).
+
+        Returns:
+            list[Detections]: One entry per frame, in frame pixel coordinates.
+        """
+        if not frames:
+            return []
+        blobs, metas = [], []
+        for frame in frames:
+            image, ratio, pad = letterbox(frame, self.imgsz)
+            # BGR HWC uint8 -> RGB CHW float in [0, 1].
+            blobs.append(image[:, :, ::-1].transpose(2, 0, 1))
+            metas.append((ratio, pad, frame.shape[:2]))
+        batch = np.ascontiguousarray(np.stack(blobs), dtype=self.input_dtype) / 255.0
+
+        if self.dynamic_batch:
+            outputs = self.session.run(None, {self.input_name: batch})[0]
+        else:
+            outputs = np.concatenate([self.session.run(None, {self.input_name: b[None]})[0] for b in batch])
+        return [self._postprocess(out, *meta, conf, classes) for out, meta in zip(outputs, metas)]
+
+    def _postprocess(self, output: np.ndarray, ratio: float, pad, shape, conf: float,
+                     classes: list[int] | None = None) -> Detections:
+        # YOLO11 output: (4 + num_classes, num_anchors) with boxes as (cx, cy, w, h).
+        preds = output.astype(np.float32).T
+        class_scores = preds[:, 4:] if classes is None else preds[:, 4:][:, classes]
+        scores = class_scores.max(axis=1)
+        keep = scores >= conf
+        if not keep.any():
+            return EMPTY_DETECTIONS
+        preds, scores = preds[keep], scores[keep]
+
+        cx, cy, w, h = preds[:, 0], preds[:, 1], preds[:, 2], preds[:, 3]
+        xywh = np.stack([cx - w / 2, cy - h / 2, w, h], axis=1)
+        indices = cv2.dnn.NMSBoxes(xywh.tolist(), scores.tolist(), conf, self.iou)
+        indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+        xywh, scores = xywh[indices], scores[indices]
+
+        # Undo the letterbox and clip to the frame.
+        xyxy = np.concatenate([xywh[:, :2], xywh[:, :2] + xywh[:, 2:]], axis=1)
+        xyxy[:, [0, 2]] = (xyxy[:, [0, 2]] - pad[0]) / ratio
+        xyxy[:, [1, 3]] = (xyxy[:, [1, 3]] - pad[1]) / ratio
+        xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, shape[1])
+        xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, shape[0])
+        return Detections(xyxy.astype(np.float32), scores.astype(np.float32))
+
+
+def load_detector(model: str | Path, backend: str = "torch", imgsz: int = 640):
+    """
+    Loads the plate detector for a backend, exporting and caching it if needed.
+
+    Args:
+        model (str | Path): Path to the .pt weights, or to an already exported model.
+        backend (str): "torch", "onnx", or "openvino".
+        imgsz (int): Inference image size.
+
+    Returns:
+        A detector usable with `batching.run_detector`.
+    """
+    model = Path(model)
+    if model.suffix == ".onnx":
+        # Exported or quantized ONNX files (e.g. from quantize.py) always run through ONNX Runtime.
+        backend = "onnx"
+    if backend == "torch":
+        from ultralytics import YOLO
+        return YOLO(str(model))
+    if backend == "onnx":
+        onnx_path = model if model.suffix == ".onnx" else export_detector(model, "onnx", imgsz)
+        return OnnxDetector(onnx_path, imgsz=imgsz)
+    if backend == "openvino":
+        from ultralytics import YOLO
+        ov_path = model if model.is_dir() else export_detector(model, "openvino", imgsz)
+        return YOLO(str(ov_path), task="detect")
+    raise ValueError(f"Unknown backend '{backend}'. Choose from {BACKENDS}.")
+
+
+def list_images(folder: str | Path) -> list[Path]:
+    """Returns the image files in a folder, sorted by name."""
+    return sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+
+
+def check_equivalence(reference, candidate, images: list[Path], conf: float = 0.25, min_iou: float = 0.9) -> dict:
+    """
+    Compares the detections of a candidate backend against the reference (torch) model.
+
+    Every reference box must be matched by a candidate box with IoU >= `min_iou`,
+    and the candidate must not produce extra boxes.
+
+    Args:
+        reference: The reference detector (usually the torch YOLO model).
+        candidate: The detector under test.
+        images (list[Path]): The images to compare on.
+        conf (float): Detection confidence threshold.
+        min_iou (float): Minimum IoU for two boxes to count as the same detection.
+
+    Returns:
+        dict: Summary with the number of mismatched images, the mean matched IoU,
+              the largest confidence difference, and an overall "equivalent" flag.
+    """
+    mismatched, ious, conf_diffs = [], [], []
+    for path in images:
+        frame = cv2.imread(str(path))
+        if frame is None:
+            continue
+        ref = run_detector(reference, [frame], conf)[0]
+        cand = run_detector(candidate, [frame], conf)[0]
+
+        unmatched = list(range(len(cand.xyxy)))
+        ok = len(ref.xyxy) == len(cand.xyxy)
+        for box, score in zip(ref.xyxy, ref.conf):
+            best = max(unmatched, key=lambda j: box_iou(box, cand.xyxy[j]), default=None)
+            if best is None or box_iou(box, cand.xyxy[best]) < min_iou:
+                ok = False
+                continue
+            ious.append(box_iou(box, cand.xyxy[best]))
+            conf_diffs.append(abs(float(score) - float(cand.conf[best])))
+            unmatched.remove(best)
+        if not ok:
+            mismatched.append(path.name)
+
+    return {
+        "images": len(images),
+        "mismatched": mismatched,
+        "mean_iou": float(np.mean(ious)) if ious else 0.0,
+        "max_conf_diff": float(max(conf_diffs)) if conf_diffs else 0.0,
+        "equivalent": not mismatched,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the export tool.
+
+    Returns:
+        argparse.Namespace: An object containing the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Export the plate detector and check it against the torch model.")
+    parser.add_argument("--model", default=str(DEFAULT_WEIGHTS), help="Path to the .pt weights to export.")
+    parser.add_argument("--backend", choices=BACKENDS[1:], default="onnx", help="Export format to build and check.")
+    parser.add_argument("--imgsz", type=int, default=640, help="Inference image size.")
+    parser.add_argument("--conf", type=float, default=0.25, help="Detection confidence threshold for the check.")
+    parser.add_argument("--check", type=Path, help="Folder of images to compare the export against the torch model.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    exported = export_detector(args.model, args.backend, args.imgsz)
+    print(f"Export ready: {exported}")
+    if not args.check:
+        return
+
+    images = list_images(args.check)
+    if not images:
+        sys.exit(f"[ERROR] No images found in: {args.check}")
+    report = check_equivalence(
+        load_detector(args.model, "torch", args.imgsz),
+        load_detector(exported, args.backend, args.imgsz),
+        images,
+        conf=args.conf,
+    )
+    print(f"Images checked: {report['images']}, mismatched: {len(report['mismatched'])}, "
+          f"mean IoU: {report['mean_iou']:.4f}, max conf diff: {report['max_conf_diff']:.4f}")
+    for name in report["mismatched"]:
+        print(f"  [MISMATCH] {name}")
+    if not report["equivalent"]:
+        sys.exit(1)
+    print("Export is equivalent to the torch model.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# batch_offline.py
+#
+# Description:
+# Offline batch processing of recorded video archives. Every video is split
+# into time segments, and the segments are processed in parallel by a pool of
+# worker processes, each holding its own copy of the detector and OCR models.
+# The plate events of all segments are merged into one JSONL file, ordered by
+# video and time.
+#
+# The run is resumable: each finished segment writes its events to
+# <state-dir>/<segment>.jsonl (atomically, via a temporary file). After a
+# crash, re-running the same command skips every segment already done.
+# Segment IDs include the frame range and a hash of the processing settings,
+# so a re-run with another --segment-seconds, model or threshold starts afresh
+# instead of reusing results of different ranges.
+#
+# A plate in view across a segment boundary is tracked by both segments. When
+# merging, an event whose track starts within --track-ttl frames of its
+# segment's start is dropped if the previous segment of the same video already
+# reported the same text.
+#
+# How to Run:
+#   python batch_offline.py "/archive/2025-06-*/*.mp4" --output events.jsonl --workers 4
+#   python batch_offline.py /archive/gate-1 --segment-seconds 120
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# --- Third-Party Library Imports ---
+import cv2
+
+# --- Local Module Imports ---
+from backends import BACKENDS, DEFAULT_WEIGHTS, load_detector
+from batching import run_detector
+from main import process_frame, region_index, report_finished
+from ocr_batch import read_plates
+from ocr_policy import OcrPolicy
+from plate_format import PlateFormat
+from tracker import PlateTracker
+
+# --- Constants ---
+VIDEO_SUFFIXES = (".mp4", ".avi", ".mkv", ".mov", ".m4v")
+
+# Models of the current worker process, loaded once by `_init_worker`.
+_WORKER: dict = {}
+
+
+def find_videos(pattern: str) -> list[Path]:
+    """
+    Expands a directory (searched recursively) or a glob pattern into video files.
+
+    Args:
+        pattern (str): A directory path or a glob such as "archive/**/*.mp4".
+
+    Returns:
+        list[Path]: The video files, sorted.
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        candidates = path.rglob("*")
+    else:
+        candidates = (Path(p) for p in glob.glob(pattern, recursive=True))
+    return sorted(p for p in candidates if p.is_file() and p.suffix.lower() in VIDEO_SUFFIXES)
+
+
+def settings_key(args: argparse.Namespace) -> str:
+    """Returns a short hash of every setting that changes the events of a segment."""
+    settings = [str(Path(args.model).resolve()), args.backend, args.imgsz, args.ocr_model, args.conf, args.raw_ocr,
+                args.track_iou, args.track_ttl, args.ocr_first_k, args.ocr_stable_m, args.vote_min_reads,
+                args.vote_threshold]
+    return hashlib.sha1(json.dumps(settings).encode()).hexdigest()[:8]
+
+
+def plan_segments(videos: list[Path], segment_seconds: float, settings: str = "") -> list[dict]:
+    """
+    Splits each video into segments of roughly `segment_seconds`.
+
+    Args:
+        videos (list[Path]): The video files.
+        segment_seconds (float): Segment length (0 = whole files).
+        settings (str): The `settings_key` of the run, made part of every segment ID.
+
+    Returns:
+        list[dict]: One job per segment with "id", "video", "start", "end" (frame
+                    indices, end exclusive) and "fps".
+    """
+    jobs = []
+    for video in videos:
+        cap = cv2.VideoCapture(str(video))
+        if not cap.isOpened():
+            print(f"[ERROR] Cannot open video, skipping: {video}")
+            continue
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        step = max(1, int(segment_seconds * fps)) if segment_seconds > 0 else max(total, 1)
+        video_key = hashlib.sha1(str(video.resolve()).encode()).hexdigest()[:12]
+        for start in range(0, max(total, 1), step):
+            end = min(start + step, total) if total else None
+            jobs.append({
+                "id": f"{video_key}_{settings}_{start:09d}_{'end' if end is None else f'{end:09d}'}",
+                "video": str(video),
+                "start": start,
+                "end": end,
+                "fps": fps,
+            })
+    return jobs
+
+
+def _init_worker(args: argparse.Namespace) -> None:
+    """Loads one copy of the models per worker process."""
+    from fast_plate_ocr import ONNXPlateRecognizer
+
+    _WORKER["args"] = args
+    _WORKER["detector"] = load_detector(args.model, args.backend, args.imgsz)
+    _WORKER["ocr"] = ONNXPlateRecognizer(args.ocr_model, device="cpu")
+
+
+def segment_event(job: dict, frame: int, track, score: float) -> dict:
+    """Builds the JSONL record of a plate reported at `frame` of a segment's video."""
+    return {
+        "video": job["video"],
+        "frame": frame,
+        "time_s": round(frame / job["fps"], 3),
+        "first_frame": job["start"] + track.first_seen,
+        "track_id": track.track_id,
+        "text": track.votes.final,
+        "category": track.category,
+        "city": track.city,
+        "bbox": [round(v, 1) for v in track.box],
+        "confidence": round(score, 4),
+    }
+
+
+def process_segment(job: dict, state_dir: str) -> tuple[str, int]:
+    """
+    Processes one segment in a worker process and stores its events.
+
+    Args:
+        job (dict): A job from `plan_segments`.
+        state_dir (str): Folder holding the per-segment result files.
+
+    Returns:
+        tuple[str, int]: The job ID and the number of events found.
+    """
+    args, detector, ocr = _WORKER["args"], _WORKER["detector"], _WORKER["ocr"]
+    tracker = PlateTracker(
+        iou_threshold=args.track_iou,
+        max_age=args.track_ttl,
+        vote_min_reads=args.vote_min_reads,
+        vote_threshold=args.vote_threshold,
+    )
+    ocr_policy = OcrPolicy(first_k=args.ocr_first_k, stable_m=args.ocr_stable_m)
+    plate_format = None if args.raw_ocr else PlateFormat(region_index)
+
+    cap = cv2.VideoCapture(job["video"])
+    cap.set(cv2.CAP_PROP_POS_FRAMES, job["start"])
+    events = []
+    frame_idx = job["start"]
+    while job["end"] is None or frame_idx < job["end"]:
+        frames = []
+        while len(frames) < args.batch_size and (job["end"] is None or frame_idx + len(frames) < job["end"]):
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        if not frames:
+            break
+
+        batch_detections = run_detector(detector, frames, args.conf)
+        batch_tracks = [tracker.update(d.xyxy) for d in batch_detections]
+        batch_texts = read_plates(ocr, frames, batch_detections, args.ocr_batch, batch_tracks, ocr_policy,
+                                  plate_format=plate_format)
+        for offset, (frame, dets, tracks, texts) in enumerate(zip(frames, batch_detections, batch_tracks, batch_texts)):
+            for track, score in process_frame(frame, dets, tracks, texts, log=False, draw=False):
+                events.append(segment_event(job, frame_idx + offset, track, score))
+        # Evicted tracks are reported at the frame they were last seen.
+        for track, score in report_finished(tracker.pop_finished(), log=False):
+            events.append(segment_event(job, job["start"] + track.last_seen, track, score))
+        frame_idx += len(frames)
+    cap.release()
+    for track, score in report_finished(tracker.flush(), log=False):
+        events.append(segment_event(job, job["start"] + track.last_seen, track, score))
+
+    # Write atomically: the result file only exists once the segment is complete.
+    target = Path(state_dir) / f"{job['id']}.jsonl"
+    tmp = target.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    os.replace(tmp, target)
+    return job["id"], len(events)
+
+
+def merge_events(jobs: list[dict], state_dir: Path, output: Path, boundary_frames: int = 0) -> tuple[int, int]:
+    """
+    Merges the per-segment result files into one file ordered by video and frame.
+
+    A track that crosses a segment boundary is reported by both segments. An event
+    is dropped as such a duplicate if its track started within `boundary_frames`
+    of its segment's start and the previous segment of the same video reported the
+    same text.
+
+    Returns:
+        tuple[int, int]: The number of events written, and of duplicates dropped.
+    """
+    events, duplicates = [], 0
+    previous_video, previous_texts = None, set()
+    for job in sorted(jobs, key=lambda j: (j["video"], j["start"])):
+        with open(state_dir / f"{job['id']}.jsonl", encoding="utf-8") as f:
+            segment = [json.loads(line) for line in f if line.strip()]
+        if job["video"] != previous_video:
+            previous_texts = set()
+        for event in segment:
+            first_frame = event.get("first_frame", event["frame"])
+            if event["text"] in previous_texts and first_frame - job["start"] <= boundary_frames:
+                duplicates += 1
+                continue
+            events.append(event)
+        previous_video, previous_texts = job["video"], {e["text"] for e in segment}
+    events.sort(key=lambda e: (e["video"], e["frame"]))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+    return len(events), duplicates
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the offline batch mode.
+
+    Returns:
+        argparse.Namespace: An object containing the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Offline, resumable plate recognition over video archives.")
+    parser.add_argument("input", help="Directory (searched recursively) or glob pattern of videos.")
+    parser.add_argument("--output", type=Path, default=Path("events.jsonl"), help="Merged JSONL event file.")
+    parser.add_argument("--state-dir", type=Path, help="Folder for per-segment results. Defaults to <output>.parts/.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes.")
+    parser.add_argument("--segment-seconds", type=float, default=300,
+                        help="Length of the time segments videos are split into (0 = whole files).")
+    parser.add_argument("--model", default=str(DEFAULT_WEIGHTS), help="Path to the YOLO plate detector.")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch", help="Detector inference backend.")
+    parser.add_argument("--imgsz", type=int, default=640, help="Detector input size.")
+    parser.add_argument("--ocr-model", default="global-plates-mobile-vit-v2-model", help="fast-plate-ocr model name.")
+    parser.add_argument("--conf", type=float, default=0.50, help="Detection confidence threshold.")
+    parser.add_argument("--batch-size", type=int, default=8, help="Frames per YOLO predict call.")
+    parser.add_argument("--ocr-batch", type=int, default=32, help="Plate crops per OCR call.")
+    parser.add_argument("--raw-ocr", action="store_true", help="Do not correct or reject reads by the plate format.")
+    parser.add_argument("--track-iou", type=float, default=0.3, help="Minimum IoU for track association.")
+    parser.add_argument("--track-ttl", type=int, default=30, help="Frames a track survives without detections.")
+    parser.add_argument("--ocr-first-k", type=int, default=3, help="Frames of each new track always read by OCR.")
+    parser.add_argument("--ocr-stable-m", type=int, default=3,
+                        help="Stop reading a track after this many identical reads in a row.")
+    parser.add_argument("--vote-min-reads", type=int, default=3, help="Minimum OCR reads before a text is final.")
+    parser.add_argument("--vote-threshold", type=float, default=0.6,
+                        help="Minimum per-character consensus (0-1) to accept a track's text.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    videos = find_videos(args.input)
+    if not videos:
+        sys.exit(f"[ERROR] No videos found for: {args.input}")
+
+    state_dir = args.state_dir or args.output.with_name(args.output.name + ".parts")
+    state_dir.mkdir(parents=True, exist_ok=True)
+    jobs = plan_segments(videos, args.segment_seconds, settings_key(args))
+    pending = [job for job in jobs if not (state_dir / f"{job['id']}.jsonl").exists()]
+    print(f"{len(videos)} video(s), {len(jobs)} segment(s), {len(jobs) - len(pending)} already done.")
+
+    if pending:
+        # ONNX Runtime / torch threads per worker, so workers do not oversubscribe the CPU.
+        os.environ.setdefault("OMP_NUM_THREADS", str(max(1, (os.cpu_count() or 1) // args.workers)))
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(args,)) as pool:
+            futures = [pool.submit(process_segment, job, str(state_dir)) for job in pending]
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    job_id, count = future.result()
+                except Exception as e:
+                    print(f"[ERROR] Segment failed, it will be retried on the next run. Details: {e}")
+                    continue
+                print(f"[{done}/{len(pending)}] Segment {job_id}: {count} event(s).")
+
+    missing = [job for job in jobs if not (state_dir / f"{job['id']}.jsonl").exists()]
+    if missing:
+        sys.exit(f"[ERROR] {len(missing)} segment(s) failed. Re-run the same command to resume.")
+    total, duplicates = merge_events(jobs, state_dir, args.output, boundary_frames=args.track_ttl)
+    print(f"Merged {total} event(s) into: {args.output} ({duplicates} duplicate(s) across segment boundaries dropped).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# batching.py
+#
+# Description:
+# Batched YOLO detection. Instead of calling `detector.predict(frame)` once per
+# frame, frames are collected into a list (up to a batch size or a deadline)
+# and passed to a single `predict` call. Each result is then routed back to the
+# frame it came from.
+#
+# Two entry points are provided:
+#   - `collect_frames` + `run_detector`: synchronous batching for a single stream.
+#   - `DetectionBatcher`: a background thread shared by several streams. Each
+#     stream submits frames and receives a Future with its own detections.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import NamedTuple
+
+# --- Third-Party Library Imports ---
+import numpy as np
+
+
+class Detections(NamedTuple):
+    """Plain per-frame detection output, independent of the detector backend."""
+    xyxy: np.ndarray  # (N, 4) float32 boxes in frame pixel coordinates.
+    conf: np.ndarray  # (N,) float32 confidence scores.
+
+
+EMPTY_DETECTIONS = Detections(np.zeros((0, 4), dtype=np.float32), np.zeros((0,), dtype=np.float32))
+
+
+def detections_from_result(result) -> Detections:
+    """
+    Converts one Ultralytics `Results` object into a `Detections` tuple.
+
+    Args:
+        result: An element of the list returned by `YOLO.predict`.
+
+    Returns:
+        Detections: The boxes and confidences as NumPy arrays.
+    """
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return EMPTY_DETECTIONS
+    return Detections(
+        boxes.xyxy.cpu().numpy().astype(np.float32),
+        boxes.conf.cpu().numpy().astype(np.float32),
+    )
+
+
+def run_detector(detector, frames: list[np.ndarray], conf: float, classes: list[int] | None = None) -> list[Detections]:
+    """
+    Runs one `predict` call on a list of frames.
+
+    Detectors that provide their own `detect(frames, conf)` method (such as the
+    ONNX Runtime backend) are called directly.
+
+    Args:
+        detector: The loaded YOLO model, or a backend detector with `detect`.
+        frames (list[np.ndarray]): BGR frames, possibly from different streams.
+        conf (float): Detection confidence threshold.
+        classes (list[int] | None): Only keep predictions of these class indices (None keeps all).
+
+    Returns:
+        list[Detections]: One entry per input frame, in the same order.
+    """
+    if not frames:
+        return []
+    if hasattr(detector, "detect"):
+        if classes is None:
+            return detector.detect(frames, conf)
+        return detector.detect(frames, conf, classes=classes)
+    results = detector.predict(frames, conf=conf, classes=classes, verbose=False)
+    return [detections_from_result(r) for r in results]
+
+
+def collect_frames(cap, batch_size: int, max_wait: float) -> list[np.ndarray]:
+    """
+    Reads up to `batch_size` frames from a capture.
+
+    The first read blocks until a frame is available. After that, frames are
+    added until the batch is full or `max_wait` seconds have passed.
+
+    Args:
+        cap: A `FrameGrabber` (or any object with `read(timeout=...)`).
+        batch_size (int): Maximum number of frames to return.
+        max_wait (float): Seconds to wait for the batch to fill after the first frame.
+
+    Returns:
+        list[np.ndarray]: The collected frames. Empty at the end of the stream.
+    """
+    ok, frame = cap.read()
+    if not ok:
+        return []
+    frames = [frame]
+    deadline = time.perf_counter() + max_wait
+    while len(frames) < batch_size:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        ok, frame = cap.read(timeout=remaining)
+        if not ok:
+            break
+        frames.append(frame)
+    return frames
+
+
+class DetectionBatcher:
+    """
+    Background thread that batches detection requests from several streams
+    through one model instance.
+    """
+
+    def __init__(self, detector, conf: float, batch_size: int = 8, max_wait: float = 0.01):
+        """
+        Args:
+            detector: The loaded YOLO model, shared by all streams.
+            conf (float): Detection confidence threshold.
+            batch_size (int): Maximum number of frames per `predict` call.
+            max_wait (float): Seconds to wait for a batch to fill after its first frame arrives.
+        """
+        self.detector = detector
+        self.conf = conf
+        self.batch_size = max(1, int(batch_size))
+        self.max_wait = max_wait
+
+        self._requests: queue.Queue = queue.Queue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._worker, name="DetectionBatcher", daemon=True)
+
+        # Counters, read by the stats/metrics code.
+        self.batches_run = 0
+        self.frames_run = 0
+
+    def start(self) -> "DetectionBatcher":
+        """Starts the worker thread and returns self for chaining."""
+        self._thread.start()
+        return self
+
+    def submit(self, frame: np.ndarray) -> Future:
+        """
+        Queues a frame for detection.
+
+        Returns:
+            Future: Resolves to the `Detections` for this frame.
+        """
+        future: Future = Future()
+        self._requests.put((frame, future))
+        return future
+
+    def stop(self) -> None:
+        """Stops the worker thread after the current batch."""
+        self._stopped.set()
+        self._thread.join(timeout=2.0)
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of frames waiting for a batch."""
+        return self._requests.qsize()
+
+    def _worker(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                batch = [self._requests.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            frames = [frame for frame, _ in batch]
+            try:
+                detections = run_detector(self.detector, frames, self.conf)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches_run += 1
+            self.frames_run += len(frames)
+            for (_, future), dets in zip(batch, detections):
+                future.set_result(dets)
+
+
+class BatchedDetector:
+    """
+    Per-stream view of a shared `DetectionBatcher`. Exposes `detect(frames, conf)`
+    like the other backend detectors, so it can be wrapped by `RoiDetector` or
+    used with `motion.gated_detect`. The confidence threshold of the batcher applies.
+    """
+
+    def __init__(self, batcher: DetectionBatcher):
+        self.batcher = batcher
+
+    def detect(self, frames: list[np.ndarray], conf: float) -> list[Detections]:
+        futures = [self.batcher.submit(frame) for frame in frames]
+        return [future.result() for future in futures]
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+# benchmark.py
+#
+# Description:
+# Reproducible CPU benchmark of the plate pipeline. A fixed set of frames (a
+# video file or a folder of images) is replayed through each stage separately:
+#   - detector:  one YOLO predict call per frame;
+#   - ocr:       grayscale crops of the detected plates + one batched OCR call;
+#   - lookup:    odd/even category and region lookup of every plate text;
+#   - render:    boxes and labels drawn onto the frame;
+#   - pipeline:  all of the above, end to end.
+# Each stage gets untimed warm-up calls and several timed repetitions. The JSON
+# report records the configuration and the machine, so runs of different
+# weights or code versions can be compared with --compare.
+#
+# Everything runs on the CPU, so results do not depend on which GPU (if any)
+# the machine has.
+#
+# How to Run:
+#   python benchmark.py --output bench_200epoch.json
+#   python benchmark.py --model yolo11n.pt --compare bench_200epoch.json
+#   python benchmark.py --source ../videos/gate.mp4 --max-frames 300 --repeats 5
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+# --- Third-Party Library Imports ---
+import cv2
+import numpy as np
+
+# --- Local Module Imports ---
+from backends import BACKENDS, DEFAULT_WEIGHTS, REPO_DIR, list_images, load_detector
+from batching import run_detector
+from evaluation import measure_latency, time_calls
+from ocr_batch import crop_gray_plates, run_ocr_batch
+from regions import plate_category
+from tracker import Track
+
+# --- Constants ---
+DEFAULT_BENCH_DIR = REPO_DIR / "models" / "model_validation" / "20_epoch" / "prediction"
+BENCH_STAGES = ("detector", "ocr", "lookup", "render", "pipeline")
+
+
+def load_frames(source: str | Path, max_frames: int = 0) -> list[np.ndarray]:
+    """
+    Loads the benchmark frames from a video file or a folder of images.
+
+    Args:
+        source (str | Path): A video file or an image folder.
+        max_frames (int): Maximum number of frames to load (0 = all).
+
+    Returns:
+        list[np.ndarray]: The BGR frames, always in the same order.
+    """
+    source = Path(source)
+    frames = []
+    if source.is_dir():
+        for path in list_images(source):
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                frames.append(frame)
+            if max_frames and len(frames) >= max_frames:
+                break
+        return frames
+
+    cap = cv2.VideoCapture(str(source))
+    while not max_frames or len(frames) < max_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def read_boxes(ocr, frame: np.ndarray, detections, ocr_batch: int = 32) -> list[str | None]:
+    """Reads every box of a frame in one OCR call; None marks empty crops, as in `ocr_batch.read_plates`."""
+    crops = crop_gray_plates(frame, detections.xyxy)
+    texts = iter(run_ocr_batch(ocr, [c for c in crops if c is not None], ocr_batch))
+    return [None if c is None else next(texts) for c in crops]
+
+
+def final_tracks(detections, texts: list[str | None]) -> list[Track]:
+    """Builds one track per box whose consensus text is already final, as in steady-state rendering."""
+    tracks = []
+    for idx, (box, text) in enumerate(zip(detections.xyxy, texts)):
+        track = Track(idx, box, 0)
+        if text:
+            track.votes.add(text)
+            track.votes.finalize()
+        track.reported = True  # Only draw; do not collect events.
+        tracks.append(track)
+    return tracks
+
+
+def run_benchmark(detector, ocr, frames: list[np.ndarray], conf: float, warmup: int, repeats: int,
+                  ocr_batch: int = 32) -> dict:
+    """
+    Times every stage of the pipeline on the same frames.
+
+    Args:
+        detector: Any detector usable with `batching.run_detector`.
+        ocr: The loaded fast-plate-ocr recognizer.
+        frames (list[np.ndarray]): The frames to replay.
+        conf (float): Detection confidence threshold.
+        warmup (int): Untimed calls per stage.
+        repeats (int): Timed passes over all frames per stage.
+        ocr_batch (int): Maximum crops per OCR call.
+
+    Returns:
+        dict: Per-stage latency statistics (ms per frame) and the number of plates found.
+    """
+    from main import process_frame, region_index
+
+    # Inputs of the later stages come from one untimed pass of the earlier ones,
+    # so every stage always sees the same work.
+    detections = [run_detector(detector, [frame], conf)[0] for frame in frames]
+    texts = [read_boxes(ocr, frame, d, ocr_batch) for frame, d in zip(frames, detections)]
+    indices = list(range(len(frames)))
+
+    def read(i):
+        read_boxes(ocr, frames[i], detections[i], ocr_batch)
+
+    def lookup(i):
+        for text in texts[i]:
+            if text:
+                plate_category(text)
+                region_index.lookup(text)
+
+    def render(i):
+        process_frame(frames[i].copy(), detections[i], final_tracks(detections[i], texts[i]), texts[i], log=False)
+
+    def pipeline(i):
+        frame = frames[i].copy()
+        dets = run_detector(detector, [frame], conf)[0]
+        plate_texts = read_boxes(ocr, frame, dets, ocr_batch)
+        process_frame(frame, dets, final_tracks(dets, plate_texts), plate_texts, log=False)
+
+    stages = {"detector": measure_latency(detector, frames, conf, warmup, repeats)}
+    for name, fn in (("ocr", read), ("lookup", lookup), ("render", render), ("pipeline", pipeline)):
+        stages[name] = time_calls(fn, indices, warmup, repeats)
+    return {"stages": stages, "plates": sum(1 for frame_texts in texts for t in frame_texts if t)}
+
+
+def machine_info() -> dict:
+    """Describes the machine, so reports from different hosts are not compared by mistake."""
+    return {
+        "host": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+    }
+
+
+def compare_reports(current: dict, baseline: dict) -> list[str]:
+    """
+    Formats the per-stage change between two reports.
+
+    Returns:
+        list[str]: One line per stage present in both reports.
+    """
+    lines = [f"{'stage':<10}{'baseline':>12}{'current':>12}{'change':>9}  (mean ms/frame)"]
+    for stage in BENCH_STAGES:
+        old = baseline.get("stages", {}).get(stage)
+        new = current["stages"].get(stage)
+        if not old or not new:
+            continue
+        change = (new["mean"] - old["mean"]) / old["mean"] if old["mean"] else 0.0
+        lines.append(f"{stage:<10}{old['mean']:>12.2f}{new['mean']:>12.2f}{change:>+9.1%}")
+    if baseline.get("machine", {}).get("host") != current["machine"]["host"]:
+        lines.append("[WARNING] The baseline was recorded on a different machine.")
+    return lines
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the benchmark.
+
+    Returns:
+        argparse.Namespace: An object containing the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="CPU benchmark of the plate pipeline, stage by stage.")
+    parser.add_argument("--source", type=Path, default=DEFAULT_BENCH_DIR, help="Video file or folder of images to replay.")
+    parser.add_argument("--max-frames", type=int, default=0, help="Maximum number of frames to load (0 = all).")
+    parser.add_argument("--model", default=str(DEFAULT_WEIGHTS), help="Path to the YOLO plate detector.")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch", help="Detector inference backend.")
+    parser.add_argument("--imgsz", type=int, default=640, help="Detector input size.")
+    parser.add_argument("--ocr-model", default="global-plates-mobile-vit-v2-model", help="fast-plate-ocr model name.")
+    parser.add_argument("--conf", type=float, default=0.50, help="Detection confidence threshold.")
+    parser.add_argument("--ocr-batch", type=int, default=32, help="Plate crops per OCR call.")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed calls per stage.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed passes over all frames per stage.")
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file (default: print it).")
+    parser.add_argument("--compare", type=Path, help="A previous JSON report to compare against.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    # CPU only: hide any GPU before torch / ONNX Runtime are imported.
+    os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+    frames = load_frames(args.source, args.max_frames)
+    if not frames:
+        sys.exit(f"[ERROR] No frames could be loaded from: {args.source}")
+
+    from fast_plate_ocr import ONNXPlateRecognizer
+
+    try:
+        detector = load_detector(args.model, args.backend, args.imgsz)
+        ocr = ONNXPlateRecognizer(args.ocr_model, device="cpu")
+    except Exception as e:
+        sys.exit(f"[ERROR] Failed to load models. Details: {e}")
+
+    print(f"Benchmarking {len(frames)} frame(s), {args.warmup} warm-up call(s), {args.repeats} repetition(s)...")
+    result = run_benchmark(detector, ocr, frames, args.conf, args.warmup, args.repeats, args.ocr_batch)
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "config": {
+            "source": str(args.source),
+            "frames": len(frames),
+            "model": str(args.model),
+            "backend": args.backend,
+            "imgsz": args.imgsz,
+            "ocr_model": args.ocr_model,
+            "conf": args.conf,
+            "ocr_batch": args.ocr_batch,
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+        },
+        **result,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(text + "\n")
+        print(f"Report saved to: {args.output}")
+    else:
+        print(text)
+
+    if args.compare:
+        try:
+            baseline = json.loads(args.compare.read_text())
+        except (OSError, ValueError) as e:
+            sys.exit(f"[ERROR] Cannot read baseline report {args.compare}. Details: {e}")
+        print("\n".join(compare_reports(report, baseline)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# capture.py
+#
+# Description:
+# Threaded frame capture for the plate OCR pipeline. A producer thread keeps
+# calling `cv2.VideoCapture.read()` and pushes frames into a bounded ring
+# buffer, so video decoding overlaps with YOLO detection and OCR instead of
+# adding to the per-frame latency of the main loop.
+#
+# Two buffer policies are available:
+#   - "latest":   keep only the newest frames and drop stale ones. Used for live
+#                 sources (webcam, RTSP/HTTP) so processing never drifts behind.
+#   - "lossless": block the producer when the buffer is full. Used for video
+#                 files, where every frame must be processed.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import threading
+from collections import deque
+
+# --- Third-Party Library Imports ---
+import cv2
+
+# --- Constants ---
+CAPTURE_POLICIES = ("latest", "lossless")
+LIVE_SOURCE_PREFIXES = ("rtsp://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+
+
+def resolve_capture_policy(source: str, policy: str = "auto") -> str:
+    """
+    Picks the buffer policy for a video source.
+
+    Args:
+        source (str): The --source value (webcam index, file path, or stream URL).
+        policy (str): "auto", "latest", or "lossless".
+
+    Returns:
+        str: "latest" for live sources and "lossless" for files when policy is "auto",
+             otherwise the requested policy.
+    """
+    if policy != "auto":
+        return policy
+    is_live = source.isdigit() or source.lower().startswith(LIVE_SOURCE_PREFIXES)
+    return "latest" if is_live else "lossless"
+
+
+class FrameGrabber:
+    """
+    Wraps a `cv2.VideoCapture` with a background reader thread and a bounded
+    frame buffer. It exposes the same `read()`, `get()`, `isOpened()` and
+    `release()` methods as `cv2.VideoCapture`, so it can be used as a drop-in
+    replacement in the main loop.
+    """
+
+    def __init__(self, cap: cv2.VideoCapture, policy: str = "lossless", buffer_size: int = 8):
+        """
+        Args:
+            cap (cv2.VideoCapture): An opened video capture.
+            policy (str): "latest" (drop stale frames) or "lossless" (never drop frames).
+            buffer_size (int): Maximum number of frames held in the buffer.
+        """
+        if policy not in CAPTURE_POLICIES:
+            raise ValueError(f"Unknown capture policy '{policy}'. Choose from {CAPTURE_POLICIES}.")
+        self.cap = cap
+        self.policy = policy
+        self.buffer_size = max(1, int(buffer_size))
+
+        self._frames: deque = deque()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._eof = False
+        self._cap_released = False
+        self._thread = threading.Thread(target=self._reader, name="FrameGrabber", daemon=True)
+
+        # Counters, read by the stats/metrics code.
+        self.frames_read = 0
+        self.frames_dropped = 0
+
+    # --- cv2.VideoCapture-compatible interface ---
+    def start(self) -> "FrameGrabber":
+        """Starts the reader thread and returns self for chaining."""
+        self._thread.start()
+        return self
+
+    def isOpened(self) -> bool:
+        return self.cap.isOpened()
+
+    def get(self, prop_id: int) -> float:
+        return self.cap.get(prop_id)
+
+    def read(self, timeout: float | None = None):
+        """
+        Returns the next frame from the buffer, blocking until one is available.
+
+        With the "latest" policy, any older frames still in the buffer are
+        discarded and only the newest frame is returned.
+
+        Args:
+            timeout (float | None): Maximum seconds to wait. None waits forever.
+
+        Returns:
+            tuple[bool, np.ndarray | None]: Same as `cv2.VideoCapture.read()`.
+            (False, None) is returned at the end of the stream or on timeout.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._frames or self._eof or self._stopped, timeout):
+                return False, None
+            if not self._frames:
+                return False, None
+            if self.policy == "latest":
+                frame = self._frames.pop()
+                self.frames_dropped += len(self._frames)
+                self._frames.clear()
+            else:
+                frame = self._frames.popleft()
+            self._cond.notify_all()  # Wake the producer if it was waiting for space.
+            return True, frame
+
+    def release(self) -> None:
+        """
+        Stops the reader thread and releases the underlying capture.
+
+        If the reader is still blocked in `cap.read()` after the join timeout, the
+        capture is released by the reader itself once that call returns, never
+        while it is in use.
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2.0)
+        if not self._thread.is_alive():
+            self._release_capture()
+
+    def _release_capture(self) -> None:
+        with self._cond:
+            if self._cap_released:
+                return
+            self._cap_released = True
+        self.cap.release()
+
+    @property
+    def finished(self) -> bool:
+        """True once the source has ended and every buffered frame has been read."""
+        return (self._eof or self._stopped) and not self._frames
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of frames currently waiting in the buffer."""
+        return len(self._frames)
+
+    # --- Producer thread ---
+    def _reader(self) -> None:
+        try:
+            self._read_loop()
+        finally:
+            # After release() gave up waiting, the capture is freed here.
+            if self._stopped:
+                self._release_capture()
+
+    def _read_loop(self) -> None:
+        while True:
+            ok, frame = self.cap.read()
+            with self._cond:
+                if self._stopped:
+                    return
+                if not ok:
+                    self._eof = True
+                    self._cond.notify_all()
+                    return
+                self.frames_read += 1
+
+                if self.policy == "lossless":
+                    # Back-pressure: wait until the consumer makes room.
+                    self._cond.wait_for(lambda: len(self._frames) < self.buffer_size or self._stopped)
+                    if self._stopped:
+                        return
+                elif len(self._frames) >= self.buffer_size:
+                    # Ring buffer: overwrite the oldest frame.
+                    self._frames.popleft()
+                    self.frames_dropped += 1
+
+                self._frames.append(frame)
+                self._cond.notify_all()
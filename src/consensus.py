@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# consensus.py
+#
+# Description:
+# Multi-frame OCR consensus for a tracked plate. A single OCR read per frame
+# flickers (e.g. "B1234KX" / "B1234KK" / "81234KX"). Instead of trusting each
+# read, the reads of a track are aligned character by character against a
+# reference read, each position is decided by a vote, and a final plate is
+# emitted only once the vote is confident enough.
+#
+# Dependencies: standard library only.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+from collections import Counter, deque
+
+
+def align_to_reference(reference: str, text: str) -> list[str | None]:
+    """
+    Aligns a read to a reference read with a Levenshtein alignment.
+
+    Args:
+        reference (str): The reference plate text.
+        text (str): Another read of the same plate.
+
+    Returns:
+        list[str | None]: For each position of `reference`, the character of `text`
+                          aligned to it, or None if `text` has no character there.
+    """
+    n, m = len(reference), len(text)
+    # dist[i][j] = edit distance between reference[:i] and text[:j].
+    dist = [[0] * (m + 1) for _ in range(n + 1)]
+    for i in range(n + 1):
+        dist[i][0] = i
+    for j in range(m + 1):
+        dist[0][j] = j
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost = 0 if reference[i - 1] == text[j - 1] else 1
+            dist[i][j] = min(dist[i - 1][j] + 1, dist[i][j - 1] + 1, dist[i - 1][j - 1] + cost)
+
+    # Walk back from the bottom-right corner to recover the alignment.
+    aligned: list[str | None] = [None] * n
+    i, j = n, m
+    while i > 0 and j > 0:
+        cost = 0 if reference[i - 1] == text[j - 1] else 1
+        if dist[i][j] == dist[i - 1][j - 1] + cost:
+            aligned[i - 1] = text[j - 1]
+            i, j = i - 1, j - 1
+        elif dist[i][j] == dist[i - 1][j] + 1:
+            i -= 1  # Character missing from `text`.
+        else:
+            j -= 1  # Extra character in `text`.
+    return aligned
+
+
+class PlateConsensus:
+    """
+    Collects the OCR reads of one track and votes on the final plate text.
+    """
+
+    def __init__(self, min_reads: int = 3, threshold: float = 0.6, max_reads: int = 15):
+        """
+        Args:
+            min_reads (int): Minimum number of reads before a final plate can be emitted.
+            threshold (float): Minimum consensus confidence (0-1) to emit a final plate.
+            max_reads (int): Number of most recent reads kept for voting.
+        """
+        self.min_reads = min_reads
+        self.threshold = threshold
+        self.reads: deque[tuple[str, float]] = deque(maxlen=max_reads)
+        self.final: str | None = None
+        self.confidence = 0.0
+
+    def add(self, plate_txt: str, weight: float = 1.0) -> str | None:
+        """
+        Adds a read and re-runs the vote.
+
+        Args:
+            plate_txt (str): The text returned by OCR.
+            weight (float): The weight of this read (e.g. the OCR confidence).
+
+        Returns:
+            str | None: The final plate text if the consensus is reached, otherwise None.
+                        Once reached, the final text does not change.
+        """
+        if plate_txt and self.final is None:
+            self.reads.append((plate_txt, weight))
+            text, self.confidence = self.vote()
+            if len(self.reads) >= self.min_reads and self.confidence >= self.threshold:
+                self.final = text
+        return self.final
+
+    def finalize(self, min_confidence: float = 0.0) -> str | None:
+        """
+        Forces the best text so far to become final, e.g. when no more reads will come.
+        Only `min_reads` is waived; the vote must still reach `min_confidence`.
+
+        Args:
+            min_confidence (float): Minimum consensus confidence (0-1) for the text to become
+                                    final. Pass `threshold` to drop reads that disagree too much.
+
+        Returns:
+            str | None: The final plate text, or None if nothing was read or the vote is
+                        below `min_confidence`.
+        """
+        if self.final is None and self.reads:
+            text, self.confidence = self.vote()
+            if self.confidence >= min_confidence:
+                self.final = text
+        return self.final
+
+    def vote(self) -> tuple[str, float]:
+        """
+        Votes position by position over the collected reads.
+
+        Returns:
+            tuple[str, float]: The best text so far and its confidence, i.e. the mean
+                               share of the vote won by each character.
+        """
+        if not self.reads:
+            return "", 0.0
+
+        # 1. The reference is the most supported read among those of the most supported length.
+        length_votes: Counter = Counter()
+        text_votes: Counter = Counter()
+        for text, weight in self.reads:
+            length_votes[len(text)] += weight
+            text_votes[text] += weight
+        length = length_votes.most_common(1)[0][0]
+        reference = max((t for t in text_votes if len(t) == length), key=text_votes.__getitem__)
+
+        # 2. Align every read to the reference and vote on each position.
+        position_votes = [Counter() for _ in reference]
+        total_weight = sum(weight for _, weight in self.reads)
+        for text, weight in self.reads:
+            for pos, char in enumerate(align_to_reference(reference, text)):
+                if char is not None:
+                    position_votes[pos][char] += weight
+
+        chars, shares = [], []
+        for pos, votes in enumerate(position_votes):
+            char, count = votes.most_common(1)[0] if votes else (reference[pos], 0.0)
+            chars.append(char)
+            shares.append(count / total_weight if total_weight else 0.0)
+        return "".join(chars), sum(shares) / len(shares)
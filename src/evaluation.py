@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# evaluation.py
+#
+# Description:
+# Accuracy and speed measurements for plate detectors, shared by the
+# quantization, benchmark, and model selection tools.
+#   - `evaluate_map`: mAP@0.5 against YOLO-format labels (e.g. dataset/test).
+#   - `measure_latency`: per-image detector latency with warm-up runs.
+#   - `time_calls`: the same warm-up/repeat timing for any stage.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import time
+from pathlib import Path
+
+# --- Third-Party Library Imports ---
+import cv2
+import numpy as np
+
+# --- Local Module Imports ---
+from batching import run_detector
+from tracker import box_iou
+
+# --- Constants ---
+REPO_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_EVAL_DIR = REPO_DIR / "dataset" / "test"
+PLATE_CLASS = 0  # "License_Plate" in dataset/data.yaml; the other classes are vehicles.
+
+
+def load_yolo_labels(label_path: Path, width: int, height: int, plate_class: int | None = PLATE_CLASS) -> np.ndarray:
+    """
+    Reads a YOLO label file as pixel boxes. Rows are either boxes (class cx cy w h)
+    or polygons (class x1 y1 x2 y2 ...), all normalised; polygons become their bounding box.
+
+    Args:
+        label_path (Path): The .txt label file.
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+        plate_class (int | None): Only keep rows of this class (None keeps every row).
+
+    Returns:
+        np.ndarray: (N, 4) boxes as (x1, y1, x2, y2). Empty if the file is missing.
+    """
+    if not label_path.exists():
+        return np.zeros((0, 4), dtype=np.float32)
+    rows = [line.split() for line in label_path.read_text().splitlines() if line.strip()]
+    boxes = []
+    for row in rows:
+        if plate_class is not None and int(row[0]) != plate_class:
+            continue
+        values = [float(v) for v in row[1:]]
+        if len(values) == 4:
+            cx, cy, w, h = values
+            boxes.append(((cx - w / 2) * width, (cy - h / 2) * height, (cx + w / 2) * width, (cy + h / 2) * height))
+        else:
+            xs, ys = values[0::2], values[1::2]
+            boxes.append((min(xs) * width, min(ys) * height, max(xs) * width, max(ys) * height))
+    return np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+
+def average_precision(scored_hits: list[tuple[float, bool]], num_targets: int) -> float:
+    """
+    Computes the area under the precision-recall curve (all-point interpolation).
+
+    Args:
+        scored_hits (list[tuple[float, bool]]): (confidence, is_true_positive) for every prediction.
+        num_targets (int): Total number of ground-truth boxes.
+
+    Returns:
+        float: The average precision in [0, 1].
+    """
+    if num_targets == 0:
+        return 0.0
+    scored_hits = sorted(scored_hits, key=lambda item: -item[0])
+    hits = np.array([hit for _, hit in scored_hits], dtype=np.float64)
+    tp = np.cumsum(hits)
+    fp = np.cumsum(1 - hits)
+    recall = np.concatenate([[0.0], tp / num_targets, [1.0]])
+    precision = np.concatenate([[1.0], tp / np.maximum(tp + fp, 1e-9), [0.0]])
+    # Make precision monotonically decreasing, then integrate over recall.
+    precision = np.flip(np.maximum.accumulate(np.flip(precision)))
+    steps = np.where(recall[1:] != recall[:-1])[0]
+    return float(np.sum((recall[steps + 1] - recall[steps]) * precision[steps + 1]))
+
+
+def evaluate_map(
+    detector,
+    data_dir: str | Path = DEFAULT_EVAL_DIR,
+    conf: float = 0.001,
+    iou: float = 0.5,
+    pred_class: int | None = PLATE_CLASS,
+) -> float:
+    """
+    Computes the detector's plate mAP@`iou` on a YOLO-format split. Only plate
+    labels count as targets, and only plate predictions are scored: vehicle
+    boxes of a multi-class model would otherwise all count as false positives.
+
+    Args:
+        detector: Any detector usable with `batching.run_detector`.
+        data_dir (str | Path): Folder containing `images/` and `labels/`.
+        conf (float): Confidence threshold; keep it low for a full precision-recall curve.
+        iou (float): IoU threshold for a prediction to count as a true positive.
+        pred_class (int | None): The plate class index in the detector's output
+                                 (None scores every prediction, for single-class models).
+
+    Returns:
+        float: The average precision.
+    """
+    data_dir = Path(data_dir)
+    scored_hits: list[tuple[float, bool]] = []
+    num_targets = 0
+    for image_path in sorted((data_dir / "images").iterdir()):
+        frame = cv2.imread(str(image_path))
+        if frame is None:
+            continue
+        targets = load_yolo_labels(data_dir / "labels" / f"{image_path.stem}.txt", frame.shape[1], frame.shape[0])
+        num_targets += len(targets)
+        preds = run_detector(detector, [frame], conf, None if pred_class is None else [pred_class])[0]
+
+        matched = set()
+        for idx in np.argsort(-preds.conf):
+            ious = [box_iou(preds.xyxy[idx], t) if t_idx not in matched else 0.0 for t_idx, t in enumerate(targets)]
+            best = int(np.argmax(ious)) if ious else -1
+            hit = best >= 0 and ious[best] >= iou
+            if hit:
+                matched.add(best)
+            scored_hits.append((float(preds.conf[idx]), hit))
+    return average_precision(scored_hits, num_targets)
+
+
+def latency_summary(samples: list[float]) -> dict:
+    """
+    Summarises latency samples.
+
+    Args:
+        samples (list[float]): Latencies in milliseconds.
+
+    Returns:
+        dict: "mean", "p50", "p95" (milliseconds) and "fps" (calls per second).
+    """
+    if not samples:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "fps": 0.0}
+    mean = float(np.mean(samples))
+    return {
+        "mean": mean,
+        "p50": float(np.percentile(samples, 50)),
+        "p95": float(np.percentile(samples, 95)),
+        "fps": 1000 / mean if mean else 0.0,
+    }
+
+
+def time_calls(fn, inputs: list, warmup: int = 3, repeats: int = 1) -> dict:
+    """
+    Times `fn(item)` for every input, after a few untimed warm-up calls.
+
+    Args:
+        fn (Callable): The function to time, called with one input at a time.
+        inputs (list): The inputs to time it on.
+        warmup (int): Untimed calls made first, so lazy initialisation is not measured.
+        repeats (int): Number of timed passes over all inputs.
+
+    Returns:
+        dict: Latency statistics, see `latency_summary`.
+    """
+    for item in inputs[:warmup]:
+        fn(item)
+    samples = []
+    for _ in range(repeats):
+        for item in inputs:
+            start = time.perf_counter()
+            fn(item)
+            samples.append((time.perf_counter() - start) * 1000)
+    return latency_summary(samples)
+
+
+def measure_latency(detector, frames: list[np.ndarray], conf: float = 0.25, warmup: int = 3, repeats: int = 1) -> dict:
+    """
+    Measures per-image detector latency.
+
+    Args:
+        detector: Any detector usable with `batching.run_detector`.
+        frames (list[np.ndarray]): The images to time.
+        conf (float): Detection confidence threshold.
+        warmup (int): Untimed runs made first, so lazy initialisation is not measured.
+        repeats (int): Number of timed passes over all frames.
+
+    Returns:
+        dict: Latency statistics in milliseconds ("mean", "p50", "p95") and "fps".
+    """
+    return time_calls(lambda frame: run_detector(detector, [frame], conf), frames, warmup, repeats)
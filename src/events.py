@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+# events.py
+#
+# Description:
+# Structured plate events and pluggable event sinks. Each reported plate
+# becomes a `PlateEvent` (timestamp, source, track id, text, category, city,
+# bounding box, confidence). Events are queued without blocking the frame loop
+# and written in batches by a background thread to one of these backends:
+#   - JSONL   (*.jsonl)            one JSON object per line.
+#   - SQLite  (*.db, *.sqlite)     WAL mode, one transaction per batch.
+#   - Parquet (*.parquet)          one row group per batch (needs `pip install pyarrow`).
+#   - Plate index (*.plateidx)     trigram search index of plate_search.py.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import json
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+# --- Constants ---
+SINK_SUFFIXES = {".jsonl": "jsonl", ".db": "sqlite", ".sqlite": "sqlite", ".sqlite3": "sqlite", ".parquet": "parquet",
+                 ".plateidx": "plate_index"}
+
+
+class PlateEvent(NamedTuple):
+    """One plate, reported once per track when its OCR consensus is final."""
+    timestamp: float              # Unix time (live streams) or seconds into the video (archives).
+    source: str                   # Stream name, camera source, or video path.
+    track_id: int
+    text: str
+    category: str
+    city: str
+    bbox: tuple[float, float, float, float]
+    confidence: float
+
+    def to_dict(self) -> dict:
+        data = self._asdict()
+        data["bbox"] = [round(v, 1) for v in self.bbox]
+        return data
+
+
+def make_event(track, confidence: float, source: str, timestamp: float | None = None) -> PlateEvent:
+    """
+    Builds the event of a reported track.
+
+    Args:
+        track (Track): The track whose consensus text is final.
+        confidence (float): The detection confidence of the box.
+        source (str): The stream name or source the track belongs to.
+        timestamp (float | None): Event time. Defaults to the current Unix time.
+
+    Returns:
+        PlateEvent: The event.
+    """
+    return PlateEvent(
+        timestamp=time.time() if timestamp is None else timestamp,
+        source=source,
+        track_id=track.track_id,
+        text=track.votes.final or track.text,
+        category=track.category,
+        city=track.city,
+        bbox=tuple(float(v) for v in track.box),
+        confidence=float(confidence),
+    )
+
+
+# -----------------------------------------------------------------------------
+# SINK BACKENDS
+# -----------------------------------------------------------------------------
+# Sinks open their files lazily, on the first write, so that connections are
+# created on the writer thread that uses them (required by sqlite3).
+
+class JsonlSink:
+    """Appends events to a JSON Lines file."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._file = None
+
+    def write_batch(self, events: list[PlateEvent]) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(json.dumps(e.to_dict(), ensure_ascii=False) + "\n" for e in events))
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class SqliteSink:
+    """Inserts events into an SQLite database in WAL mode."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path))
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS plate_events ("
+            "id INTEGER PRIMARY KEY, timestamp REAL, source TEXT, track_id INTEGER, text TEXT, "
+            "category TEXT, city TEXT, x1 REAL, y1 REAL, x2 REAL, y2 REAL, confidence REAL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_plate_events_text ON plate_events (text)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_plate_events_time ON plate_events (timestamp)")
+        return conn
+
+    def write_batch(self, events: list[PlateEvent]) -> None:
+        if self._conn is None:
+            self._conn = self._connect()
+        rows = [(e.timestamp, e.source, e.track_id, e.text, e.category, e.city, *e.bbox, e.confidence) for e in events]
+        with self._conn:  # One transaction per batch.
+            self._conn.executemany(
+                "INSERT INTO plate_events (timestamp, source, track_id, text, category, city, x1, y1, x2, y2, confidence) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def close(self) -> None:
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+
+class ParquetSink:
+    """Writes events to a Parquet file, one row group per batch."""
+
+    def __init__(self, path: str | Path):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("The Parquet event sink requires pyarrow (`pip install pyarrow`).") from None
+        self.path = Path(path)
+        self._writer = None
+
+    def write_batch(self, events: list[PlateEvent]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = {field: [getattr(e, field) for e in events] for field in PlateEvent._fields}
+        columns["bbox"] = [list(b) for b in columns["bbox"]]
+        table = pa.table(columns)
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(str(self.path), table.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+
+def open_sink(path: str | Path):
+    """
+    Creates the sink matching a file's suffix.
+
+    Raises:
+        ValueError: If the suffix is not a known sink format.
+    """
+    kind = SINK_SUFFIXES.get(Path(path).suffix.lower())
+    if kind == "jsonl":
+        return JsonlSink(path)
+    if kind == "sqlite":
+        return SqliteSink(path)
+    if kind == "parquet":
+        return ParquetSink(path)
+    if kind == "plate_index":
+        from plate_search import PlateIndexSink
+
+        return PlateIndexSink(path)
+    raise ValueError(f"Unknown event sink format '{Path(path).suffix}'. Use one of: {', '.join(SINK_SUFFIXES)}.")
+
+
+# -----------------------------------------------------------------------------
+# BACKGROUND WRITER
+# -----------------------------------------------------------------------------
+class EventWriter:
+    """
+    Buffers events and writes them to one or more sinks in batches on a
+    background thread. `emit` never blocks the frame loop: when the queue is
+    full, the event is dropped and counted.
+    """
+
+    def __init__(self, sinks: list, batch_size: int = 256, flush_interval: float = 1.0, max_queue: int = 10000):
+        """
+        Args:
+            sinks (list): The sinks every batch is written to.
+            batch_size (int): Maximum number of events per write.
+            flush_interval (float): Maximum seconds an event waits before being written.
+            max_queue (int): Maximum number of events waiting to be written.
+        """
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._worker, name="EventWriter", daemon=True)
+
+        # Counters, read by the stats/metrics code. Written and failed events are
+        # counted once per sink, so one failing sink does not hide the others.
+        self.events_written = 0
+        self.events_failed = 0
+        self.events_dropped = 0
+
+    def start(self) -> "EventWriter":
+        """Starts the writer thread and returns self for chaining."""
+        self._thread.start()
+        return self
+
+    def emit(self, event: PlateEvent) -> None:
+        """Queues an event without blocking."""
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.events_dropped += 1
+
+    def close(self) -> None:
+        """Writes all queued events, then closes the sinks (on the writer thread)."""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=10.0)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def _worker(self) -> None:
+        while not (self._stopped.is_set() and self._queue.empty()):
+            batch = []
+            deadline = time.perf_counter() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0 or (self._stopped.is_set() and self._queue.empty()):
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=min(remaining, 0.1)))
+                except queue.Empty:
+                    continue
+            if not batch:
+                continue
+            for sink in self.sinks:
+                try:
+                    sink.write_batch(batch)
+                except Exception as e:
+                    self.events_failed += len(batch)
+                    print(f"[ERROR] Event sink {type(sink).__name__} failed to write {len(batch)} event(s). Details: {e}")
+                else:
+                    self.events_written += len(batch)
+
+        for sink in self.sinks:
+            sink.close()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# metrics.py
+#
+# Description:
+# Optional Prometheus-style metrics endpoint for long-running streams. A small
+# HTTP server on a local port serves the text exposition format at /metrics:
+# throughput, dropped frames, detections, plate events, OCR calls, queue
+# depths, and per-stage latency histograms.
+#
+# Nothing is locked on the hot path: the processing loop keeps updating its
+# plain counters (each owned by a single thread), and the exporter only reads
+# them when Prometheus scrapes.
+#
+# How to Run:
+#   python main.py --source rtsp://... --metrics-port 9108
+#   curl http://127.0.0.1:9108/metrics
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Local Module Imports ---
+from stats import LATENCY_BUCKETS
+
+# (metric name, type, help text, getter taking the registered parts of one stream).
+COUNTERS = (
+    ("alpr_frames_processed_total", "counter", "Frames that went through the whole pipeline.",
+     lambda p: p["stats"].frames if "stats" in p else None),
+    ("alpr_frames_read_total", "counter", "Frames decoded by the capture thread.",
+     lambda p: p["capture"].frames_read if "capture" in p else None),
+    ("alpr_frames_dropped_total", "counter", "Frames dropped by the capture buffer.",
+     lambda p: p["capture"].frames_dropped if "capture" in p else None),
+    ("alpr_video_frames_dropped_total", "counter", "Frames dropped by the output video writer queue.",
+     lambda p: p["video_writer"].frames_dropped if p.get("video_writer") else None),
+    ("alpr_detection_skipped_total", "counter", "Frames on which the motion gate skipped detection.",
+     lambda p: p["motion_gate"].frames_skipped if p.get("motion_gate") else None),
+    ("alpr_plate_detections_total", "counter", "Plate boxes returned by the detector.",
+     lambda p: p["stats"].counters.get("detections", 0) if "stats" in p else None),
+    ("alpr_plate_events_total", "counter", "Plates reported (one per track, once the OCR vote is final).",
+     lambda p: p["stats"].counters.get("events", 0) if "stats" in p else None),
+    ("alpr_ocr_calls_total", "counter", "Plate crops sent to OCR.",
+     lambda p: p["ocr_policy"].calls_made if "ocr_policy" in p else None),
+    ("alpr_ocr_calls_saved_total", "counter", "Plate crops skipped by the OCR policy.",
+     lambda p: p["ocr_policy"].calls_saved if "ocr_policy" in p else None),
+    ("alpr_ocr_reads_corrected_total", "counter", "OCR reads corrected to the plate format.",
+     lambda p: p["plate_format"].reads_corrected if p.get("plate_format") else None),
+    ("alpr_ocr_reads_rejected_total", "counter", "OCR reads rejected because they cannot be a plate.",
+     lambda p: p["plate_format"].reads_rejected if p.get("plate_format") else None),
+    ("alpr_events_written_total", "counter", "Plate events written, counted once per sink.",
+     lambda p: p["event_writer"].events_written if p.get("event_writer") else None),
+    ("alpr_events_failed_total", "counter", "Plate events a sink failed to write, counted once per sink.",
+     lambda p: p["event_writer"].events_failed if p.get("event_writer") else None),
+    ("alpr_events_dropped_total", "counter", "Plate events dropped because the writer queue was full.",
+     lambda p: p["event_writer"].events_dropped if p.get("event_writer") else None),
+    ("alpr_tracks_active", "gauge", "Plate tracks currently alive.",
+     lambda p: len(p["tracker"].tracks) if "tracker" in p else None),
+    ("alpr_capture_queue_depth", "gauge", "Decoded frames waiting in the capture buffer.",
+     lambda p: p["capture"].queue_depth if "capture" in p else None),
+    ("alpr_detection_queue_depth", "gauge", "Frames waiting for a shared detection batch.",
+     lambda p: p["batcher"].queue_depth if p.get("batcher") else None),
+    ("alpr_event_queue_depth", "gauge", "Plate events waiting to be written.",
+     lambda p: p["event_writer"].queue_depth if p.get("event_writer") else None),
+    ("alpr_video_queue_depth", "gauge", "Frames waiting to be encoded into the output video.",
+     lambda p: p["video_writer"].queue_depth if p.get("video_writer") else None),
+    ("alpr_fps", "gauge", "Frames per second over the last 60 frames.",
+     lambda p: round(p["stats"].fps, 3) if "stats" in p else None),
+)
+
+
+def escape_label(value) -> str:
+    """Escapes a label value for the exposition format: backslash, double quote and newline."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsExporter:
+    """Serves the counters of one or more registered streams at /metrics."""
+
+    def __init__(self, port: int, host: str = "127.0.0.1"):
+        """
+        Args:
+            port (int): TCP port to listen on.
+            host (str): Interface to bind. Defaults to localhost only.
+        """
+        self.host = host
+        self.port = port
+        self.streams: dict[str, dict] = {}
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Keep scrapes out of the console.
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsExporter", daemon=True)
+
+    def register(self, stream: str, **parts) -> None:
+        """
+        Registers the pipeline objects of a stream. Any of these keyword arguments
+        may be given: stats, capture, tracker, ocr_policy, motion_gate, batcher, event_writer,
+        video_writer.
+
+        Args:
+            stream (str): Value of the "stream" label for this stream's metrics.
+        """
+        self.streams[stream] = parts
+
+    def start(self) -> "MetricsExporter":
+        """Starts serving in a background thread and returns self for chaining."""
+        self._thread.start()
+        print(f"Metrics available at http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def render(self) -> str:
+        """
+        Formats all metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The response body.
+        """
+        lines = []
+        # Stream names come from the config file, so they may contain any character.
+        streams = [(escape_label(stream), parts) for stream, parts in list(self.streams.items())]
+        for name, kind, help_text, getter in COUNTERS:
+            values = []
+            for stream, parts in streams:
+                try:
+                    value = getter(parts)
+                except Exception:
+                    value = None
+                if value is not None:
+                    values.append(f'{name}{{stream="{stream}"}} {value}')
+            if values:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", *values]
+
+        # Per-stage latency histograms.
+        name = "alpr_stage_latency_seconds"
+        lines += [f"# HELP {name} Per-frame latency of each pipeline stage.", f"# TYPE {name} histogram"]
+        for stream, parts in streams:
+            stats = parts.get("stats")
+            if stats is None:
+                continue
+            for stage, hist in list(stats.histograms.items()):
+                # Copy the numbers first; the loop thread may add a sample meanwhile.
+                counts, total, count = list(hist.bucket_counts), hist.total, hist.count
+                labels = f'stream="{stream}",stage="{escape_label(stage)}"'
+                cumulative = 0
+                for bound, bucket in zip(LATENCY_BUCKETS, counts):
+                    cumulative += bucket
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative + counts[-1]}')
+                lines.append(f"{name}_sum{{{labels}}} {total}")
+                lines.append(f"{name}_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
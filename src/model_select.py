@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# model_select.py
+#
+# Description:
+# Automatic choice of the detector weights for the local machine. Only weights
+# whose class names include a licence-plate class are candidates; the stock
+# COCO yolo11n/s/m/l/x weights in models/trained_model/ are skipped. Each
+# candidate is measured on the CPU:
+#   - accuracy: plate mAP@0.5 on the held-out split (dataset/test);
+#   - speed:    per-image latency (mean, p95) and FPS on the same images.
+# The most accurate candidate that reaches the minimum plate mAP and meets both
+# the FPS target and the p95 latency budget is selected. If none does,
+# calibration fails instead of picking a model that cannot find plates.
+#
+# The decision is cached per machine (and backend / input size) in
+# models/model_selection.json, so calibration only runs once. main.py uses it
+# with `--model auto`.
+#
+# How to Run:
+#   python model_select.py
+#   python model_select.py --target-fps 20 --max-latency 60 --min-map 0.6 --backend onnx
+#   python main.py --source 0 --model auto
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# --- Third-Party Library Imports ---
+import cv2
+
+# --- Local Module Imports ---
+from backends import BACKENDS, REPO_DIR, list_images, load_detector
+from benchmark import machine_info
+from evaluation import DEFAULT_EVAL_DIR, evaluate_map, measure_latency
+
+# --- Constants ---
+CANDIDATE_DIR = REPO_DIR / "models" / "trained_model"
+SELECTION_CACHE = REPO_DIR / "models" / "model_selection.json"
+DEFAULT_TARGET_FPS = 15.0
+DEFAULT_MAX_LATENCY_MS = 100.0
+DEFAULT_MIN_MAP50 = 0.5
+
+
+def find_candidates(folder: str | Path = CANDIDATE_DIR) -> list[Path]:
+    """Returns the .pt weights in a folder, sorted by name."""
+    return sorted(Path(folder).glob("*.pt"))
+
+
+def plate_class_index(names: dict) -> int | None:
+    """Returns the index of the licence-plate class in a model's class names, or None."""
+    for idx, name in names.items():
+        if "plate" in str(name).lower():
+            return int(idx)
+    return None
+
+
+def machine_key(backend: str, imgsz: int) -> str:
+    """
+    Identifies the machine and inference setup a decision is valid for.
+
+    Returns:
+        str: A short hash of the CPU/platform description, the backend and the input size.
+    """
+    info = machine_info()
+    fingerprint = [info["host"], info["platform"], info["processor"], info["cpu_count"], backend, imgsz]
+    return hashlib.sha1(json.dumps(fingerprint).encode()).hexdigest()[:16]
+
+
+def measure_candidate(weights: Path, backend: str, imgsz: int, eval_dir: Path, frames: list, warmup: int,
+                      repeats: int) -> dict:
+    """
+    Measures the accuracy and CPU speed of one candidate.
+
+    Returns:
+        dict: "model", "plate_class", "map50" (plate predictions only), and the latency
+              statistics from `measure_latency` ("mean", "p50", "p95", "fps").
+
+    Raises:
+        ValueError: If the weights have no licence-plate class.
+    """
+    from ultralytics import YOLO
+
+    names = YOLO(str(weights)).names
+    plate_class = plate_class_index(names)
+    if plate_class is None:
+        shown = ", ".join(str(n) for n in list(names.values())[:5])
+        raise ValueError(f"{weights.name} has no licence-plate class (classes: {shown}, ...).")
+    detector = load_detector(weights, backend, imgsz)
+    speed = measure_latency(detector, frames, conf=0.25, warmup=warmup, repeats=repeats)
+    map50 = evaluate_map(detector, eval_dir, pred_class=plate_class)
+    return {"model": str(weights), "plate_class": plate_class, "map50": map50, **speed}
+
+
+def choose_model(results: list[dict], target_fps: float, max_latency_ms: float,
+                 min_map50: float = DEFAULT_MIN_MAP50) -> dict:
+    """
+    Picks the most accurate candidate that is accurate enough and within the speed budget.
+
+    Args:
+        results (list[dict]): Measurements from `measure_candidate`.
+        target_fps (float): Minimum frames per second.
+        max_latency_ms (float): Maximum p95 latency per image, in milliseconds.
+        min_map50 (float): Minimum plate mAP@0.5.
+
+    Returns:
+        dict: The chosen result.
+
+    Raises:
+        RuntimeError: If no candidate meets both the accuracy and the speed requirements.
+    """
+    accurate = [r for r in results if r["map50"] >= min_map50]
+    if not accurate:
+        best = max((r["map50"] for r in results), default=0.0)
+        raise RuntimeError(f"No candidate reaches the minimum plate mAP@0.5 of {min_map50:g} "
+                           f"(best: {best:.4f}).")
+    in_budget = [r for r in accurate if r["fps"] >= target_fps and r["p95"] <= max_latency_ms]
+    if not in_budget:
+        fastest = max(accurate, key=lambda r: r["fps"])
+        raise RuntimeError(f"No accurate candidate meets {target_fps:g} FPS / {max_latency_ms:g} ms p95 "
+                           f"(fastest: {Path(fastest['model']).name} at {fastest['fps']:.1f} FPS, "
+                           f"{fastest['p95']:.1f} ms p95). Relax the budget or use a faster backend.")
+    # Most accurate first; among equally accurate models, the faster one.
+    return max(in_budget, key=lambda r: (round(r["map50"], 3), r["fps"]))
+
+
+def load_cache(path: Path = SELECTION_CACHE) -> dict:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def cached_selection(backend: str, imgsz: int, path: Path = SELECTION_CACHE) -> dict | None:
+    """
+    Returns the cached decision for this machine, backend and input size.
+
+    A decision is ignored once its chosen weights file no longer exists, or if it
+    predates the plate-class check (no "plate_class" recorded).
+
+    Returns:
+        dict | None: The cache entry (with "model"), or None if calibration is needed.
+    """
+    entry = load_cache(path).get(machine_key(backend, imgsz))
+    if entry and "plate_class" in entry and Path(entry["model"]).exists():
+        return entry
+    return None
+
+
+def calibrate(
+    candidates: list[Path],
+    backend: str = "torch",
+    imgsz: int = 640,
+    eval_dir: Path = DEFAULT_EVAL_DIR,
+    target_fps: float = DEFAULT_TARGET_FPS,
+    max_latency_ms: float = DEFAULT_MAX_LATENCY_MS,
+    min_map50: float = DEFAULT_MIN_MAP50,
+    warmup: int = 3,
+    repeats: int = 2,
+    path: Path = SELECTION_CACHE,
+) -> dict:
+    """
+    Measures every candidate, chooses one, and stores the decision in the cache.
+
+    Returns:
+        dict: The cache entry: the chosen "model" and its "plate_class", the targets,
+              and the measurements of every candidate.
+
+    Raises:
+        RuntimeError: If no candidate can be measured or none meets the requirements.
+    """
+    frames = [f for f in (cv2.imread(str(p)) for p in list_images(eval_dir / "images")) if f is not None]
+    results = []
+    for weights in candidates:
+        print(f"Measuring {weights.name}...")
+        try:
+            result = measure_candidate(weights, backend, imgsz, eval_dir, frames, warmup, repeats)
+        except Exception as e:
+            print(f"[ERROR] Skipping {weights.name}. Details: {e}")
+            continue
+        print(f"  mAP@0.5: {result['map50']:.4f}   {result['mean']:.1f} ms mean, "
+              f"{result['p95']:.1f} ms p95, {result['fps']:.1f} FPS")
+        results.append(result)
+    if not results:
+        raise RuntimeError("None of the candidate models could be measured (no plate detector found).")
+
+    chosen = choose_model(results, target_fps, max_latency_ms, min_map50)
+    entry = {
+        "model": chosen["model"],
+        "plate_class": chosen["plate_class"],
+        "target_fps": target_fps,
+        "max_latency_ms": max_latency_ms,
+        "min_map50": min_map50,
+        "backend": backend,
+        "imgsz": imgsz,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": machine_info(),
+        "results": results,
+    }
+    cache = load_cache(path)
+    cache[machine_key(backend, imgsz)] = entry
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(cache, indent=2) + "\n")
+    return entry
+
+
+def resolve_auto_model(backend: str, imgsz: int) -> str:
+    """
+    Returns the weights chosen for this machine, calibrating first if nothing is cached.
+
+    Calibration runs in a separate process so it is CPU-only without hiding the
+    GPU from the caller.
+
+    Returns:
+        str: Path of the selected weights.
+    """
+    entry = cached_selection(backend, imgsz)
+    if entry is None:
+        print("No model selection cached for this machine; calibrating once (this can take a few minutes)...")
+        script = Path(__file__).resolve()
+        subprocess.run([sys.executable, str(script), "--backend", backend, "--imgsz", str(imgsz)], check=True)
+        entry = cached_selection(backend, imgsz)
+        if entry is None:
+            raise RuntimeError("Model calibration did not produce a decision.")
+    return entry["model"]
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the model selection tool.
+
+    Returns:
+        argparse.Namespace: An object containing the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Pick the most accurate detector that meets a CPU speed budget.")
+    parser.add_argument("--candidates", type=Path, default=CANDIDATE_DIR, help="Folder of candidate .pt weights.")
+    parser.add_argument("--eval", type=Path, default=DEFAULT_EVAL_DIR,
+                        help="Held-out YOLO-format split (images/ + labels/) used for mAP and latency.")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch", help="Detector inference backend.")
+    parser.add_argument("--imgsz", type=int, default=640, help="Detector input size.")
+    parser.add_argument("--target-fps", type=float, default=DEFAULT_TARGET_FPS, help="Minimum detector FPS.")
+    parser.add_argument("--max-latency", type=float, default=DEFAULT_MAX_LATENCY_MS,
+                        help="Maximum p95 detector latency per image, in milliseconds.")
+    parser.add_argument("--min-map", type=float, default=DEFAULT_MIN_MAP50,
+                        help="Minimum plate mAP@0.5 on the held-out split.")
+    parser.add_argument("--repeats", type=int, default=2, help="Timed passes over the held-out images.")
+    parser.add_argument("--force", action="store_true", help="Recalibrate even if a decision is cached.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    # CPU only: hide any GPU before torch / ONNX Runtime are imported.
+    os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+    if not args.force:
+        entry = cached_selection(args.backend, args.imgsz)
+        if entry:
+            print(f"Cached selection for this machine: {entry['model']} (use --force to recalibrate).")
+            return
+
+    candidates = find_candidates(args.candidates)
+    if not candidates:
+        sys.exit(f"[ERROR] No .pt weights found in: {args.candidates}")
+    try:
+        entry = calibrate(candidates, args.backend, args.imgsz, args.eval, args.target_fps, args.max_latency,
+                          args.min_map, repeats=args.repeats)
+    except RuntimeError as e:
+        sys.exit(f"[ERROR] {e}")
+
+    print(f"Selected: {entry['model']} (plate mAP@0.5 >= {args.min_map:g}, meets {args.target_fps:g} FPS / "
+          f"{args.max_latency:g} ms p95).")
+    print(f"Decision cached in: {SELECTION_CACHE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# motion.py
+#
+# Description:
+# Motion/change gating in front of the plate detector. Each frame is downscaled
+# to grayscale and compared with the frame on which detection last ran (frame
+# differencing), or fed to a MOG2 background subtractor. When too few pixels
+# in the region of interest have changed, YOLO is skipped and the previous
+# detections are reused. This saves most of the detector budget on static
+# scenes such as an empty gate lane at night.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+
+# --- Third-Party Library Imports ---
+import cv2
+import numpy as np
+
+# --- Local Module Imports ---
+from batching import EMPTY_DETECTIONS, Detections, run_detector
+
+# --- Constants ---
+MOTION_METHODS = ("diff", "mog2")
+
+
+def parse_roi(text: str | None) -> tuple[int, int, int, int] | None:
+    """
+    Parses an ROI given as "x1,y1,x2,y2" in frame pixels.
+
+    Args:
+        text (str | None): The ROI string from the command line.
+
+    Returns:
+        tuple[int, int, int, int] | None: The ROI, or None if no ROI was given.
+    """
+    if not text:
+        return None
+    values = [int(v) for v in text.split(",")]
+    if len(values) != 4 or min(values) < 0 or values[0] >= values[2] or values[1] >= values[3]:
+        raise ValueError(f"Invalid ROI '{text}'. Expected x1,y1,x2,y2 >= 0 with x1 < x2 and y1 < y2.")
+    return tuple(values)
+
+
+def clip_roi(roi: tuple[int, int, int, int], width: int, height: int) -> tuple[int, int, int, int]:
+    """
+    Clips an ROI to the frame.
+
+    Args:
+        roi (tuple[int, int, int, int]): (x1, y1, x2, y2) in frame pixels.
+        width (int): Frame width.
+        height (int): Frame height.
+
+    Returns:
+        tuple[int, int, int, int]: The part of the ROI inside the frame.
+
+    Raises:
+        ValueError: If the ROI lies entirely outside the frame.
+    """
+    x1, y1, x2, y2 = max(roi[0], 0), max(roi[1], 0), min(roi[2], width), min(roi[3], height)
+    if x1 >= x2 or y1 >= y2:
+        raise ValueError(f"Motion ROI {roi} lies outside the {width}x{height} frame.")
+    return x1, y1, x2, y2
+
+
+class MotionGate:
+    """
+    Decides whether a frame differs enough from the last detected frame to be
+    worth running the detector on.
+    """
+
+    def __init__(
+        self,
+        method: str = "diff",
+        roi: tuple[int, int, int, int] | None = None,
+        width: int = 160,
+        pixel_threshold: int = 25,
+        min_changed: float = 0.005,
+        max_skip: int = 50,
+    ):
+        """
+        Args:
+            method (str): "diff" (frame differencing) or "mog2" (background subtraction).
+            roi (tuple | None): (x1, y1, x2, y2) region to watch, in frame pixels. None watches the whole frame.
+            width (int): Width the ROI is downscaled to before comparison.
+            pixel_threshold (int): Minimum grey-level difference for a pixel to count as changed.
+            min_changed (float): Minimum fraction of changed pixels for the frame to count as changed.
+            max_skip (int): Run the detector at least once every `max_skip` frames regardless.
+        """
+        if method not in MOTION_METHODS:
+            raise ValueError(f"Unknown motion method '{method}'. Choose from {MOTION_METHODS}.")
+        self.method = method
+        self.roi = roi
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_changed = min_changed
+        self.max_skip = max_skip
+
+        self._reference: np.ndarray | None = None
+        self._frame_size: tuple[int, int] | None = None
+        self._clipped_roi = roi
+        self._since_detect = 0
+        self._subtractor = cv2.createBackgroundSubtractorMOG2(detectShadows=False) if method == "mog2" else None
+        self.last_detections: Detections = EMPTY_DETECTIONS
+
+        # Counters, read by the stats/metrics code.
+        self.frames_checked = 0
+        self.frames_skipped = 0
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        if self.roi:
+            # Clip once per frame size; an ROI entirely outside the frame raises ValueError.
+            if self._frame_size != frame.shape[:2]:
+                self._frame_size = frame.shape[:2]
+                self._clipped_roi = clip_roi(self.roi, frame.shape[1], frame.shape[0])
+                if self._clipped_roi != self.roi:
+                    print(f"[WARNING] Motion ROI {self.roi} clipped to the frame: {self._clipped_roi}.")
+            x1, y1, x2, y2 = self._clipped_roi
+            frame = frame[y1:y2, x1:x2]
+        h, w = frame.shape[:2]
+        small = cv2.resize(frame, (self.width, max(1, round(h * self.width / w))), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def changed(self, frame: np.ndarray) -> bool:
+        """
+        Checks a frame for change and updates the gate's state.
+
+        Args:
+            frame (np.ndarray): The BGR frame.
+
+        Returns:
+            bool: True if the detector should run on this frame.
+
+        Raises:
+            ValueError: If the ROI lies entirely outside the frame.
+        """
+        self.frames_checked += 1
+        small = self._prepare(frame)
+
+        if self._subtractor is not None:
+            mask = self._subtractor.apply(small)
+            changed_ratio = np.count_nonzero(mask) / mask.size
+        elif self._reference is None or self._reference.shape != small.shape:
+            changed_ratio = 1.0
+        else:
+            diff = cv2.absdiff(small, self._reference)
+            changed_ratio = np.count_nonzero(diff > self.pixel_threshold) / diff.size
+
+        if changed_ratio >= self.min_changed or self._since_detect >= self.max_skip:
+            # Compare future frames against this one, so slow changes still add up.
+            self._reference = small
+            self._since_detect = 0
+            return True
+
+        self._since_detect += 1
+        self.frames_skipped += 1
+        return False
+
+    @property
+    def skip_ratio(self) -> float:
+        """Fraction of checked frames on which detection was skipped."""
+        return self.frames_skipped / self.frames_checked if self.frames_checked else 0.0
+
+
+def gated_detect(detector, frames: list[np.ndarray], conf: float, gate: MotionGate | None) -> list[Detections]:
+    """
+    Runs the detector on the frames that changed, and reuses the previous
+    detections for the others.
+
+    Args:
+        detector: Any detector usable with `batching.run_detector`.
+        frames (list[np.ndarray]): Consecutive frames of one stream.
+        conf (float): Detection confidence threshold.
+        gate (MotionGate | None): The motion gate. None runs the detector on every frame.
+
+    Returns:
+        list[Detections]: One entry per frame, in the same order.
+    """
+    if gate is None:
+        return run_detector(detector, frames, conf)
+
+    moving = [gate.changed(frame) for frame in frames]
+    detected = iter(run_detector(detector, [f for f, m in zip(frames, moving) if m], conf))
+    batch_detections = []
+    for is_moving in moving:
+        if is_moving:
+            gate.last_detections = next(detected)
+        batch_detections.append(gate.last_detections)
+    return batch_detections
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# ocr_batch.py
+#
+# Description:
+# Batched OCR for plate crops. Instead of calling `ocr.run(gray_crop)` once per
+# plate, all grayscale crops of a frame (or of several consecutive frames) are
+# resized to the OCR model's input size, stacked, and sent to the ONNX session
+# in a single call. The texts are then mapped back to their boxes.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+
+# --- Third-Party Library Imports ---
+import cv2
+import numpy as np
+
+# --- Local Module Imports ---
+from stats import NULL_STATS
+
+
+def ocr_input_size(ocr) -> tuple[int, int] | None:
+    """
+    Reads the expected (width, height) of the OCR model from its config.
+
+    Args:
+        ocr: The loaded fast-plate-ocr recognizer.
+
+    Returns:
+        tuple[int, int] | None: The input size, or None if it cannot be determined.
+    """
+    config = getattr(ocr, "config", None)
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        width, height = config.get("img_width"), config.get("img_height")
+    else:
+        width, height = getattr(config, "img_width", None), getattr(config, "img_height", None)
+    if not width or not height:
+        return None
+    return int(width), int(height)
+
+
+def crop_gray_plates(frame: np.ndarray, xyxy: np.ndarray) -> list[np.ndarray | None]:
+    """
+    Crops every box from a frame and converts it to grayscale.
+
+    Args:
+        frame (np.ndarray): The BGR frame.
+        xyxy (np.ndarray): (N, 4) boxes in frame pixel coordinates.
+
+    Returns:
+        list[np.ndarray | None]: One grayscale crop per box, or None for empty crops.
+    """
+    crops = []
+    for box in xyxy:
+        x1, y1, x2, y2 = map(int, box)
+        crop = frame[y1:y2, x1:x2]
+        crops.append(cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.size else None)
+    return crops
+
+
+def run_ocr_batch(ocr, crops: list[np.ndarray], max_batch: int = 32) -> list[str]:
+    """
+    Runs OCR on a list of grayscale crops using as few ONNX calls as possible.
+
+    Args:
+        ocr: The loaded fast-plate-ocr recognizer.
+        crops (list[np.ndarray]): Grayscale plate crops of any size.
+        max_batch (int): Maximum number of crops per ONNX call.
+
+    Returns:
+        list[str]: The recognized text for each crop, in the same order.
+    """
+    if not crops:
+        return []
+
+    size = ocr_input_size(ocr)
+    if size is None:
+        # Unknown input size: the crops cannot be stacked, fall back to one call each.
+        return [ocr.run(crop)[0] for crop in crops]
+
+    resized = [cv2.resize(crop, size, interpolation=cv2.INTER_LINEAR) for crop in crops]
+    texts: list[str] = []
+    step = max(1, int(max_batch))
+    for start in range(0, len(resized), step):
+        texts.extend(ocr.run(resized[start:start + step]))
+    return texts
+
+
+def read_plates(
+    ocr,
+    frames: list[np.ndarray],
+    batch_detections: list,
+    max_batch: int = 32,
+    batch_tracks: list | None = None,
+    policy=None,
+    stats=NULL_STATS,
+    plate_format=None,
+) -> list[list[str | None]]:
+    """
+    Reads all plates of several consecutive frames, pooling their crops into
+    shared OCR batches.
+
+    When tracks are given, every fresh read is added to its track's consensus
+    vote. With an `OcrPolicy` as well, only the crops selected by the policy are
+    sent to OCR; the others reuse the latest text of their track. With a
+    `PlateFormat`, fresh reads are corrected to the plate grammar, and reads that
+    cannot be a plate come back as "" and are left out of the vote.
+
+    Args:
+        ocr: The loaded fast-plate-ocr recognizer.
+        frames (list[np.ndarray]): The BGR frames.
+        batch_detections (list[Detections]): The detections of each frame.
+        max_batch (int): Maximum number of crops per ONNX call.
+        batch_tracks (list[list[Track]] | None): The track of each box, per frame.
+        policy (OcrPolicy | None): Decides which tracked crops are worth reading.
+        stats (StageStats): Receives the time spent in the "crop" and "ocr" stages.
+        plate_format (PlateFormat | None): Corrects or rejects each fresh read.
+
+    Returns:
+        list[list[str | None]]: For each frame, one text per box. None marks an empty crop.
+    """
+    use_policy = policy is not None and batch_tracks is not None
+    pooled: list[np.ndarray] = []
+    slots: list[tuple[int, int]] = []
+    texts: list[list[str | None]] = []
+    for frame_idx, (frame, detections) in enumerate(zip(frames, batch_detections)):
+        with stats.time("crop"):
+            crops = crop_gray_plates(frame, detections.xyxy)
+        texts.append([None] * len(crops))
+        for box_idx, crop in enumerate(crops):
+            if crop is None:
+                continue
+            if use_policy:
+                track = batch_tracks[frame_idx][box_idx]
+                if not policy.should_read(track, crop):
+                    texts[frame_idx][box_idx] = track.text
+                    continue
+            pooled.append(crop)
+            slots.append((frame_idx, box_idx))
+
+    with stats.time("ocr", frames=len(frames)):
+        pooled_texts = run_ocr_batch(ocr, pooled, max_batch)
+        if plate_format is not None:
+            pooled_texts = [plate_format.constrain(text) for text in pooled_texts]
+    for (frame_idx, box_idx), text in zip(slots, pooled_texts):
+        texts[frame_idx][box_idx] = text
+        if batch_tracks is not None:
+            track = batch_tracks[frame_idx][box_idx]
+            track.votes.add(text)
+            if use_policy:
+                policy.record(track, text)
+    return texts
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# ocr_policy.py
+#
+# Description:
+# Per-track OCR throttling. Once a plate is tracked, running OCR on it in every
+# frame wastes most of the OCR budget. The policy below reads a track only:
+#   - on its first K frames, or
+#   - when the crop becomes noticeably sharper or larger than the best crop read so far,
+# and stops reading it for good once the same text has been read M times in a row
+# (or once the track's consensus vote has produced a final plate).
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+
+# --- Third-Party Library Imports ---
+import cv2
+import numpy as np
+
+# --- Local Module Imports ---
+from tracker import Track
+
+
+def crop_sharpness(gray_crop: np.ndarray) -> float:
+    """
+    Measures the sharpness of a grayscale crop as the variance of its Laplacian.
+
+    Args:
+        gray_crop (np.ndarray): The grayscale plate crop.
+
+    Returns:
+        float: Higher values mean a sharper image.
+    """
+    return float(cv2.Laplacian(gray_crop, cv2.CV_64F).var())
+
+
+class OcrPolicy:
+    """
+    Decides, for each tracked plate crop, whether OCR should run on it.
+    The per-track state is stored on the `Track` objects themselves, so it is
+    evicted together with the track.
+    """
+
+    def __init__(self, first_k: int = 3, stable_m: int = 3, improve_ratio: float = 1.25):
+        """
+        Args:
+            first_k (int): Number of reads always made when a track starts.
+            stable_m (int): Number of identical consecutive reads after which a track is final.
+            improve_ratio (float): Factor by which sharpness or area must exceed the best crop
+                                   read so far to trigger another read.
+        """
+        self.first_k = first_k
+        self.stable_m = stable_m
+        self.improve_ratio = improve_ratio
+
+        # Counters, read by the stats/metrics code.
+        self.calls_made = 0
+        self.calls_saved = 0
+
+    def should_read(self, track: Track, gray_crop: np.ndarray) -> bool:
+        """
+        Decides whether to run OCR on this crop, and updates the track's counters.
+
+        Args:
+            track (Track): The track the crop belongs to.
+            gray_crop (np.ndarray): The grayscale plate crop.
+
+        Returns:
+            bool: True if OCR should run on the crop.
+        """
+        if track.ocr_done:
+            self.calls_saved += 1
+            return False
+
+        area = gray_crop.shape[0] * gray_crop.shape[1]
+        sharpness = crop_sharpness(gray_crop)
+        improved = (
+            area > track.best_area * self.improve_ratio
+            or sharpness > track.best_sharpness * self.improve_ratio
+        )
+
+        if track.ocr_calls < self.first_k or improved:
+            track.ocr_calls += 1
+            track.best_area = max(track.best_area, area)
+            track.best_sharpness = max(track.best_sharpness, sharpness)
+            self.calls_made += 1
+            return True
+
+        self.calls_saved += 1
+        return False
+
+    def record(self, track: Track, plate_txt: str) -> None:
+        """
+        Records an OCR result and ends OCR for the track once the text is stable
+        or the track's consensus vote is final.
+
+        Args:
+            track (Track): The track that was read.
+            plate_txt (str): The text returned by OCR.
+        """
+        if not plate_txt:
+            track.stable_reads = 0
+            return
+        track.stable_reads = track.stable_reads + 1 if plate_txt == track.last_read else 1
+        track.last_read = plate_txt
+        if track.votes.final is not None:
+            track.ocr_done = True
+        elif track.stable_reads >= self.stable_m:
+            # No more reads will come, so settle the vote with what it has.
+            track.votes.finalize()
+            track.ocr_done = True
+
+    @property
+    def saved_ratio(self) -> float:
+        """Fraction of tracked crops for which OCR was skipped."""
+        total = self.calls_made + self.calls_saved
+        return self.calls_saved / total if total else 0.0
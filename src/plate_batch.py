@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# plate_batch.py
+#
+# Description:
+# Batch plate parsing and categorisation for offline reprocessing of stored
+# reads. `get_plate_category` and `get_detailed_city_from_code` take one string
+# at a time and run several regexes per call; `parse_plates` takes a whole
+# list (or NumPy array) of plate texts and returns columns instead:
+#   text, prefix, number, suffix, category, city
+# It uses the compiled parser of regions.py (no regex) and parses each distinct
+# text only once: stored reads repeat the same plates over and over.
+#
+# The CLI re-categorises a JSONL file of events (from --events or
+# batch_offline.py) and writes the result to any event sink.
+#
+# How to Run:
+#   python plate_batch.py events.jsonl --output events_enriched.parquet
+#   python plate_batch.py archive_events.jsonl --output analytics.db
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Iterable
+
+# --- Local Module Imports ---
+from events import PlateEvent, open_sink
+from region_db import load_region_index
+from regions import RegionIndex, plate_category, split_plate
+
+# --- Constants ---
+PLATE_COLUMNS = ("text", "prefix", "number", "suffix", "category", "city")
+
+
+def parse_plates(texts: Iterable[str], index: RegionIndex) -> dict[str, list[str]]:
+    """
+    Parses and categorises many plate texts at once.
+
+    Args:
+        texts (Iterable[str]): Plate texts (list, tuple, or NumPy string array). None counts as "".
+        index (RegionIndex): The compiled region index.
+
+    Returns:
+        dict[str, list[str]]: One column per name in `PLATE_COLUMNS`, each as long as `texts`.
+                              "category" and "city" match `get_plate_category` and
+                              `get_detailed_city_from_code` for every row.
+    """
+    texts = ["" if t is None else str(t) for t in texts]
+    parsed: dict[str, tuple[str, str, str, str, str]] = {}
+    for text in set(texts):
+        prefix, number, suffix = split_plate(text)
+        parsed[text] = (prefix, number, suffix, plate_category(text), index.lookup_parts(prefix, suffix))
+
+    rows = [parsed[text] for text in texts]
+    columns = {"text": texts}
+    for position, name in enumerate(PLATE_COLUMNS[1:]):
+        columns[name] = [row[position] for row in rows]
+    return columns
+
+
+def categorize_events(events: list[PlateEvent], index: RegionIndex) -> list[PlateEvent]:
+    """
+    Recomputes the category and city of stored events, e.g. after the region table changed.
+
+    Returns:
+        list[PlateEvent]: The events with updated "category" and "city" fields.
+    """
+    columns = parse_plates((e.text for e in events), index)
+    return [
+        event._replace(category=category, city=city)
+        for event, category, city in zip(events, columns["category"], columns["city"])
+    ]
+
+
+def event_from_record(record: dict) -> PlateEvent:
+    """
+    Builds a `PlateEvent` from a JSONL record written by an event sink or by batch_offline.py.
+
+    Returns:
+        PlateEvent: The event. Archive records use the video path as source and the
+                    time into the video as timestamp.
+    """
+    return PlateEvent(
+        timestamp=float(record.get("timestamp", record.get("time_s", 0.0))),
+        source=str(record.get("source", record.get("video", ""))),
+        track_id=int(record.get("track_id", -1)),
+        text=record.get("text") or "",
+        category=record.get("category", ""),
+        city=record.get("city", ""),
+        bbox=tuple(record.get("bbox", (0.0, 0.0, 0.0, 0.0))),
+        confidence=float(record.get("confidence", 0.0)),
+    )
+
+
+def read_event_batches(path: Path, batch_size: int):
+    """Yields lists of up to `batch_size` events from a JSONL file."""
+    batch = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            batch.append(event_from_record(json.loads(line)))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the batch re-categorisation tool.
+
+    Returns:
+        argparse.Namespace: An object containing the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Re-categorise stored plate events in batches.")
+    parser.add_argument("input", type=Path, help="JSONL events (from --events or batch_offline.py).")
+    parser.add_argument("--output", type=Path, required=True,
+                        help="Output event sink: .jsonl, .db/.sqlite (WAL), .parquet, or .plateidx.")
+    parser.add_argument("--batch-size", type=int, default=100000, help="Events parsed and written per batch.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    index = load_region_index()
+    try:
+        sink = open_sink(args.output)
+    except (ImportError, ValueError) as e:
+        sys.exit(f"[ERROR] Cannot open event sink. Details: {e}")
+
+    total = 0
+    try:
+        for batch in read_event_batches(args.input, args.batch_size):
+            sink.write_batch(categorize_events(batch, index))
+            total += len(batch)
+    except (OSError, ValueError) as e:
+        sys.exit(f"[ERROR] Failed to re-categorise {args.input}. Details: {e}")
+    finally:
+        sink.close()
+    print(f"Re-categorised {total} event(s) into: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# plate_format.py
+#
+# Description:
+# Format-constrained decoding of OCR reads for Indonesian plates. A plate is
+#   prefix (1-2 letters, a known region code) + number (1-4 digits) + suffix (1-3 letters)
+# (the notebook's ^([A-Z]{1,2})(\d{1,4})([A-Z]{1,3})$). Plates without a suffix
+# (e.g. some official plates) can be allowed explicitly.
+# The recognizer does not know this grammar, so it regularly returns a digit
+# where only a letter can stand, or the reverse (0/O, 1/I, 8/B, ...).
+# `PlateFormat` tries every split of the read that fits the grammar. Each
+# character that is in the wrong class for its position is swapped with its
+# look-alike, and each swap costs one. The cheapest valid split wins. Reads
+# that cannot fit the grammar, whose number starts with 0, or that would need
+# swapping half of their characters or more, are rejected, so they never reach
+# the track's consensus vote.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+
+# --- Local Module Imports ---
+from regions import DIGITS, LETTERS, RegionIndex
+
+# --- Constants ---
+# Look-alike characters the recognizer confuses, by the class required at a position.
+TO_DIGIT = {"O": "0", "D": "0", "Q": "0", "I": "1", "L": "1", "Z": "2", "S": "5", "G": "6", "B": "8"}
+TO_LETTER = {"0": "O", "1": "I", "2": "Z", "5": "S", "6": "G", "8": "B"}
+PREFIX_LENGTHS = (2, 1)
+NUMBER_LENGTHS = range(1, 5)
+SUFFIX_LENGTHS = range(1, 4)
+
+
+def _as_letters(chars: str) -> tuple[str, int] | None:
+    """Maps a segment to letters. Returns (letters, number of swaps), or None if impossible."""
+    out, cost = [], 0
+    for ch in chars:
+        if ch in LETTERS:
+            out.append(ch)
+        elif ch in TO_LETTER:
+            out.append(TO_LETTER[ch])
+            cost += 1
+        else:
+            return None
+    return "".join(out), cost
+
+
+def _as_digits(chars: str) -> tuple[str, int] | None:
+    """Maps a segment to digits. Returns (digits, number of swaps), or None if impossible."""
+    out, cost = [], 0
+    for ch in chars:
+        if ch in DIGITS:
+            out.append(ch)
+        elif ch in TO_DIGIT:
+            out.append(TO_DIGIT[ch])
+            cost += 1
+        else:
+            return None
+    return "".join(out), cost
+
+
+class PlateFormat:
+    """Corrects or rejects OCR reads so that they follow the Indonesian plate grammar."""
+
+    def __init__(self, index: RegionIndex, max_swaps: int = 2, allow_empty_suffix: bool = False):
+        """
+        Args:
+            index (RegionIndex): The region codes; prefixes must be one of its keys.
+            max_swaps (int): Maximum number of look-alike swaps in one read; reads
+                             needing more are rejected rather than guessed.
+            allow_empty_suffix (bool): Also accept plates without suffix letters. Off by
+                                       default: short garbage ("HOLD", "8888") would fit.
+        """
+        self.index = index
+        self.prefixes = index.prefixes
+        self.max_swaps = max_swaps
+        self.suffix_lengths = range(0, SUFFIX_LENGTHS.stop) if allow_empty_suffix else SUFFIX_LENGTHS
+
+        # Counters, read by the stats/metrics code.
+        self.reads_valid = 0
+        self.reads_corrected = 0
+        self.reads_rejected = 0
+
+    def parse(self, plate_txt: str) -> tuple[str, str, str] | None:
+        """
+        Finds the cheapest reading of a plate that fits the grammar.
+
+        Ties are broken against a suffix with no registered city for the prefix,
+        then against swapping digits into suffix letters, then in favour of the
+        longer (2-letter) prefix.
+
+        Args:
+            plate_txt (str): The raw OCR text. Separators and padding are ignored.
+
+        Returns:
+            tuple[str, str, str] | None: (prefix, number, suffix), or None if no split
+                                         fits within `max_swaps` swaps.
+        """
+        decoded = self._decode(plate_txt)
+        return decoded[0] if decoded else None
+
+    def _decode(self, plate_txt: str) -> tuple[tuple[str, str, str], int] | None:
+        """Returns the best (prefix, number, suffix) split and its number of swaps, or None."""
+        clean = "".join(ch for ch in plate_txt.upper() if ch in LETTERS or ch in DIGITS)
+        best, best_key = None, None
+        for prefix_len in PREFIX_LENGTHS:
+            for suffix_len in self.suffix_lengths:
+                number_len = len(clean) - prefix_len - suffix_len
+                if number_len not in NUMBER_LENGTHS:
+                    continue
+                prefix = _as_letters(clean[:prefix_len])
+                if prefix is None or prefix[0] not in self.prefixes:
+                    continue
+                number = _as_digits(clean[prefix_len:prefix_len + number_len])
+                suffix = _as_letters(clean[prefix_len + number_len:])
+                if number is None or suffix is None or number[0].startswith("0"):
+                    continue
+                cost = prefix[1] + number[1] + suffix[1]
+                # A read that needs most of its characters swapped is not a plate.
+                if cost > self.max_swaps or 2 * cost >= len(clean):
+                    continue
+                # An empty suffix is neither registered nor unregistered.
+                unregistered = bool(suffix[0]) and self.index.get(prefix[0], suffix[0][:1]) is None
+                key = (cost, unregistered, suffix[1], -prefix_len)
+                if best_key is None or key < best_key:
+                    best, best_key = ((prefix[0], number[0], suffix[0]), cost), key
+        return best
+
+    def constrain(self, plate_txt: str) -> str:
+        """
+        Returns the corrected plate text (e.g. "8 1234 XY" -> "B1234XY"), or "" if the
+        read cannot be a valid plate. Empty reads are ignored by the consensus vote.
+        """
+        if not plate_txt:
+            return plate_txt
+        decoded = self._decode(plate_txt)
+        if decoded is None:
+            self.reads_rejected += 1
+            return ""
+        parts, cost = decoded
+        # Case, separators and padding are normalised silently; only swaps count as corrections.
+        if cost:
+            self.reads_corrected += 1
+        else:
+            self.reads_valid += 1
+        return "".join(parts)
@@ -0,0 +1,384 @@
+#!/usr/bin/env python
+# plate_search.py
+#
+# Description:
+# Fuzzy search over stored plate events. Investigators rarely have the exact
+# text: a witness remembers "B 12?4 KX*", or OCR misread one character. This
+# module keeps an on-disk SQLite index of every reported plate:
+#   plates      each distinct plate text once (compact, e.g. "B1234KXY"), with its length.
+#   plate_grams trigram inverted index over the distinct texts ("^B1", "B12", ..., "XY$").
+#   sightings   one row per event: plate, time, camera/source, city, track, confidence.
+# Queries go from trigrams to a few candidate texts, are verified exactly, and
+# only then touch the sightings, so their cost depends on the number of
+# distinct plates that share trigrams with the query, not on the number of
+# stored reads. Two query forms are supported:
+#   - wildcards:     "?" is exactly one character, "*" any number of characters.
+#   - edit distance: plates within N (at most 2) insertions/deletions/substitutions
+#                    of the query. Each edit destroys at most 3 trigrams, so a match
+#                    must share len(query) - 3 * N of them with the query; queries too
+#                    short for that bound are refused rather than answered by a full
+#                    scan (use a wildcard pattern or a smaller distance instead).
+#
+# The index is updated incrementally by the event writer: any --events path
+# ending in ".plateidx" is a `PlateIndexSink`.
+#
+# How to Run:
+#   python main.py --source cam.mp4 --events events.db --events plates.plateidx
+#   python plate_search.py add archive_events.jsonl --index plates.plateidx
+#   python plate_search.py query "B 12?4 KX*" --index plates.plateidx
+#   python plate_search.py query "B1234KXY" --distance 1 --since 2026-10-01 --source gate_north
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+# --- Local Module Imports ---
+from events import PlateEvent
+from regions import DIGITS, LETTERS
+
+# --- Constants ---
+WILDCARDS = frozenset("?*")
+GRAM_SIZE = 3
+MAX_DISTANCE = 2  # With 3, typical plates (<= 9 characters) have no trigram bound left.
+
+
+class PlateMatch(NamedTuple):
+    """One sighting of a plate that matches a search."""
+    text: str
+    distance: int                 # Edit distance to the query (0 for wildcard matches).
+    timestamp: float
+    source: str
+    city: str
+    track_id: int
+    confidence: float
+
+
+def normalize_plate(plate_txt: str, keep: frozenset = frozenset()) -> str:
+    """Uppercases a plate and drops everything but A-Z, 0-9 and the characters in `keep`."""
+    return "".join(ch for ch in plate_txt.upper() if ch in LETTERS or ch in DIGITS or ch in keep)
+
+
+def trigrams(text: str, anchored_start: bool = True, anchored_end: bool = True) -> set[str]:
+    """
+    Returns the trigrams of a plate text, padded with "^" and "$" so that short
+    plates still have grams and the ends of a plate are indexed.
+    """
+    padded = ("^" if anchored_start else "") + text + ("$" if anchored_end else "")
+    return {padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1)}
+
+
+def pattern_trigrams(pattern: str) -> set[str]:
+    """Returns the trigrams every plate matching a wildcard pattern must contain."""
+    padded = ("" if pattern.startswith("*") else "^") + pattern + ("" if pattern.endswith("*") else "$")
+    grams = set()
+    for run in re.split(r"[?*]", padded):
+        grams |= trigrams(run, anchored_start=False, anchored_end=False)
+    return grams
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Levenshtein distance between two plate texts, or `max_distance + 1` as soon
+    as it is known to exceed `max_distance`.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous[-1], max_distance + 1)
+
+
+class PlateIndex:
+    """Trigram-indexed store of plate sightings in an SQLite database (WAL mode)."""
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path (str | Path): The index file. It is created if it does not exist.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS plates (id INTEGER PRIMARY KEY, text TEXT UNIQUE NOT NULL, "
+                "length INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_plates_length ON plates (length)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS plate_grams (gram TEXT NOT NULL, plate_id INTEGER NOT NULL, "
+                "PRIMARY KEY (gram, plate_id)) WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sightings (id INTEGER PRIMARY KEY, plate_id INTEGER NOT NULL, "
+                "timestamp REAL, source TEXT, city TEXT, track_id INTEGER, confidence REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sightings_plate ON sightings (plate_id, timestamp)"
+            )
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS hits (plate_id INTEGER PRIMARY KEY, distance INTEGER)")
+
+    def add(self, events: Iterable[PlateEvent]) -> int:
+        """
+        Adds events to the index in one transaction. Events without plate text are skipped.
+
+        Returns:
+            int: The number of sightings added.
+        """
+        added = 0
+        with self._conn:
+            for event in events:
+                text = normalize_plate(event.text or "")
+                if not text:
+                    continue
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO plates (text, length) VALUES (?, ?)", (text, len(text))
+                )
+                if cursor.rowcount:
+                    # A new distinct plate: index its trigrams once.
+                    plate_id = cursor.lastrowid
+                    self._conn.executemany(
+                        "INSERT INTO plate_grams (gram, plate_id) VALUES (?, ?)",
+                        [(gram, plate_id) for gram in trigrams(text)],
+                    )
+                else:
+                    plate_id = self._conn.execute("SELECT id FROM plates WHERE text = ?", (text,)).fetchone()[0]
+                self._conn.execute(
+                    "INSERT INTO sightings (plate_id, timestamp, source, city, track_id, confidence) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (plate_id, event.timestamp, event.source, event.city, event.track_id, event.confidence),
+                )
+                added += 1
+        return added
+
+    def _candidates(self, grams: set[str], min_shared: int, where: str, params: tuple) -> list[tuple[int, str]]:
+        """Returns (id, text) of the plates sharing at least `min_shared` of `grams` and matching `where`."""
+        if grams and min_shared > 0:
+            marks = ", ".join("?" * len(grams))
+            sql = (f"SELECT p.id, p.text FROM (SELECT plate_id FROM plate_grams WHERE gram IN ({marks}) "
+                   f"GROUP BY plate_id HAVING COUNT(*) >= ?) g JOIN plates p ON p.id = g.plate_id WHERE {where}")
+            return self._conn.execute(sql, (*grams, min_shared, *params)).fetchall()
+        # A wildcard pattern without any 3-character literal run: scan the distinct texts.
+        return self._conn.execute(f"SELECT p.id, p.text FROM plates p WHERE {where}", params).fetchall()
+
+    def matching_plates(self, query: str, max_distance: int = 0) -> dict[int, int]:
+        """
+        Finds the distinct plate texts matching a query.
+
+        Args:
+            query (str): A plate text, or a pattern with "?" and "*" wildcards.
+                         Spaces, dashes and case are ignored.
+            max_distance (int): Maximum edit distance for plain queries (ignored for patterns).
+
+        Returns:
+            dict[int, int]: {plate id: edit distance to the query}.
+
+        Raises:
+            ValueError: If the query is empty, `max_distance` is out of range, or the
+                        query is too short to be searched at that distance.
+        """
+        pattern = normalize_plate(query, keep=WILDCARDS)
+        if not pattern.strip("*"):
+            raise ValueError(f"Query '{query}' has no plate characters.")
+        if not 0 <= max_distance <= MAX_DISTANCE:
+            raise ValueError(f"Edit distance must be between 0 and {MAX_DISTANCE}.")
+
+        if WILDCARDS & set(pattern):
+            # GLOB understands "?" and "*" natively; the trigrams only narrow the candidates.
+            grams = pattern_trigrams(pattern)
+            rows = self._candidates(grams, len(grams), "p.text GLOB ?", (pattern,))
+            return {plate_id: 0 for plate_id, _ in rows}
+
+        if max_distance == 0:
+            row = self._conn.execute("SELECT id FROM plates WHERE text = ?", (pattern,)).fetchone()
+            return {row[0]: 0} if row else {}
+
+        # Each edit destroys at most GRAM_SIZE trigrams, so a match shares at least this many.
+        grams = trigrams(pattern)
+        min_shared = len(grams) - GRAM_SIZE * max_distance
+        if min_shared <= 0:
+            raise ValueError(f"Query '{query}' is too short for edit distance {max_distance}; "
+                             f"use a smaller distance or a wildcard pattern.")
+        rows = self._candidates(grams, min_shared, "p.length BETWEEN ? AND ?",
+                                (len(pattern) - max_distance, len(pattern) + max_distance))
+        matches = {}
+        for plate_id, text in rows:
+            distance = edit_distance(pattern, text, max_distance)
+            if distance <= max_distance:
+                matches[plate_id] = distance
+        return matches
+
+    def search(
+        self,
+        query: str,
+        max_distance: int = 0,
+        since: float | None = None,
+        until: float | None = None,
+        source: str | None = None,
+        city: str | None = None,
+        limit: int = 100,
+    ) -> list[PlateMatch]:
+        """
+        Finds the sightings of every plate matching a query.
+
+        Args:
+            query (str): A plate text, or a pattern with "?" and "*" wildcards.
+            max_distance (int): Maximum edit distance for plain queries.
+            since (float | None): Only sightings at or after this timestamp.
+            until (float | None): Only sightings before this timestamp.
+            source (str | None): Only sightings from this camera/stream.
+            city (str | None): Only sightings whose city contains this text (case-insensitive).
+            limit (int): Maximum number of sightings returned.
+
+        Returns:
+            list[PlateMatch]: Closest matches first, then the most recent sightings first.
+        """
+        matches = self.matching_plates(query, max_distance)
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("s.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("s.timestamp < ?")
+            params.append(until)
+        if source is not None:
+            conditions.append("s.source = ?")
+            params.append(source)
+        if city is not None:
+            conditions.append("s.city LIKE ?")
+            params.append(f"%{city}%")
+        where = " AND ".join(conditions) or "1"
+
+        with self._conn:
+            self._conn.execute("DELETE FROM hits")
+            self._conn.executemany("INSERT INTO hits (plate_id, distance) VALUES (?, ?)", matches.items())
+        # CROSS JOIN keeps the (small) hit list as the outer loop; the planner has no
+        # statistics for the temp table and would otherwise scan all sightings.
+        rows = self._conn.execute(
+            "SELECT p.text, h.distance, s.timestamp, s.source, s.city, s.track_id, s.confidence "
+            "FROM hits h CROSS JOIN sightings s ON s.plate_id = h.plate_id JOIN plates p ON p.id = h.plate_id "
+            f"WHERE {where} ORDER BY h.distance, s.timestamp DESC LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [PlateMatch(*row) for row in rows]
+
+    def counts(self) -> tuple[int, int]:
+        """Returns (distinct plates, sightings)."""
+        plates = self._conn.execute("SELECT COUNT(*) FROM plates").fetchone()[0]
+        sightings = self._conn.execute("SELECT COUNT(*) FROM sightings").fetchone()[0]
+        return plates, sightings
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class PlateIndexSink:
+    """Event sink that adds every written batch to a `PlateIndex`."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._index: PlateIndex | None = None
+
+    def write_batch(self, events: list[PlateEvent]) -> None:
+        if self._index is None:
+            self._index = PlateIndex(self.path)
+        self._index.add(events)
+
+    def close(self) -> None:
+        if self._index:
+            self._index.close()
+            self._index = None
+
+
+def parse_time(value: str) -> float:
+    """Parses a Unix timestamp, seconds into a video, or an ISO date/time (local time)."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is neither a number nor an ISO date/time.") from None
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the plate search tool.
+
+    Returns:
+        argparse.Namespace: An object containing the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Fuzzy and wildcard search over stored plate events.")
+    parser.add_argument("--index", type=Path, default=Path("plates.plateidx"), help="Path of the plate index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Add JSONL events (from --events or batch_offline.py) to the index.")
+    add.add_argument("inputs", type=Path, nargs="+", help="JSONL event files.")
+    add.add_argument("--batch-size", type=int, default=100000, help="Events added per transaction.")
+
+    query = commands.add_parser("query", help="Search the index.")
+    query.add_argument("query", help="Plate text or pattern, e.g. \"B 12?4 KX*\" ('?' one char, '*' any).")
+    query.add_argument("--distance", type=int, default=0,
+                       help=f"Maximum edit distance for plain queries (0-{MAX_DISTANCE}).")
+    query.add_argument("--since", type=parse_time, help="Earliest sighting (timestamp or ISO date/time).")
+    query.add_argument("--until", type=parse_time, help="Latest sighting, exclusive (timestamp or ISO date/time).")
+    query.add_argument("--source", help="Only sightings from this camera/stream.")
+    query.add_argument("--city", help="Only sightings whose city/region contains this text.")
+    query.add_argument("--limit", type=int, default=50, help="Maximum number of sightings shown.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    try:
+        index = PlateIndex(args.index)
+    except sqlite3.Error as e:
+        sys.exit(f"[ERROR] Cannot open plate index {args.index}. Details: {e}")
+
+    if args.command == "add":
+        from plate_batch import read_event_batches
+
+        total = 0
+        try:
+            for path in args.inputs:
+                for batch in read_event_batches(path, args.batch_size):
+                    total += index.add(batch)
+        except (OSError, ValueError) as e:
+            sys.exit(f"[ERROR] Failed to index events. Details: {e}")
+        plates, sightings = index.counts()
+        print(f"Indexed {total} sighting(s); {args.index} holds {plates} plates, {sightings} sightings.")
+        index.close()
+        return
+
+    t_start = time.perf_counter()
+    try:
+        matches = index.search(args.query, args.distance, args.since, args.until, args.source, args.city, args.limit)
+    except ValueError as e:
+        sys.exit(f"[ERROR] {e}")
+    elapsed_ms = (time.perf_counter() - t_start) * 1000
+    for m in matches:
+        print(f"{m.text:<10} d={m.distance}  {m.timestamp:>14.3f}  {m.source:<20} {m.city:<30} "
+              f"track {m.track_id} ({m.confidence:.2f})")
+    print(f"{len(matches)} sighting(s) in {elapsed_ms:.1f} ms.")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# quantize.py
+#
+# Description:
+# INT8 post-training quantization of the plate detector for CPU deployment.
+# The FP32 ONNX export (see backends.py) is statically quantized with ONNX
+# Runtime, using a folder of images as the calibration set. The tool then
+# reports the mAP drift and the measured speedup of the INT8 model against
+# the FP32 model. Calibration images come from the training split and must
+# not overlap the evaluation split, or the drift would be measured on the
+# very images the activation ranges were fitted to.
+#
+# Dependencies:
+#   - ONNX Runtime ≥ 1.16 (`pip install onnxruntime`)
+#
+# How to Run:
+#   python quantize.py
+#   python quantize.py --calib /path/to/calibration/images --calib-count 300 --eval ../dataset/test
+#
+# The result can be loaded directly by main.py:
+#   python main.py --backend onnx --model ../models/trained_model/licence_plate_model_200epoch_640_int8.onnx
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import hashlib
+import sys
+from pathlib import Path
+
+# --- Third-Party Library Imports ---
+import cv2
+import numpy as np
+
+# --- Local Module Imports ---
+from backends import DEFAULT_WEIGHTS, REPO_DIR, OnnxDetector, export_detector, letterbox, list_images
+from evaluation import DEFAULT_EVAL_DIR, evaluate_map, measure_latency
+
+# --- Constants ---
+DEFAULT_CALIB_DIR = REPO_DIR / "dataset" / "train" / "images"
+DEFAULT_CALIB_COUNT = 200
+
+
+class ImageCalibrationReader:
+    """
+    Feeds calibration images to ONNX Runtime's static quantizer, preprocessed
+    exactly like `OnnxDetector` does at inference time.
+    """
+
+    def __init__(self, images: list[Path], input_name: str, imgsz: int):
+        self.images = images
+        self.input_name = input_name
+        self.imgsz = imgsz
+        self._iter = iter(images)
+
+    def get_next(self) -> dict | None:
+        for path in self._iter:
+            frame = cv2.imread(str(path))
+            if frame is None:
+                continue
+            image, _, _ = letterbox(frame, self.imgsz)
+            blob = image[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+            return {self.input_name: np.ascontiguousarray(blob)}
+        return None
+
+    def rewind(self) -> None:
+        self._iter = iter(self.images)
+
+
+def sample_images(images: list[Path], count: int) -> list[Path]:
+    """Returns `count` images spread evenly over the (sorted) list, or all of them if there are fewer."""
+    if count <= 0 or len(images) <= count:
+        return images
+    step = len(images) / count
+    return [images[int(i * step)] for i in range(count)]
+
+
+def overlapping_images(calib_images: list[Path], eval_images: list[Path]) -> list[Path]:
+    """
+    Finds calibration images whose content is identical to an evaluation image.
+    Files are compared by content digest, since exports often rename the same image.
+
+    Returns:
+        list[Path]: The calibration images that also appear in the evaluation set.
+    """
+    def digest(path: Path) -> str:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+
+    eval_digests = {digest(p) for p in eval_images}
+    return [p for p in calib_images if digest(p) in eval_digests]
+
+
+def quantize_detector(fp32_path: Path, int8_path: Path, calib_images: list[Path], imgsz: int = 640) -> Path:
+    """
+    Statically quantizes an FP32 ONNX detector to INT8.
+
+    Args:
+        fp32_path (Path): The FP32 .onnx model.
+        int8_path (Path): Where to write the INT8 model.
+        calib_images (list[Path]): Images used to calibrate activation ranges.
+        imgsz (int): Detector input size.
+
+    Returns:
+        Path: The INT8 model path.
+    """
+    import onnxruntime as ort
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+
+    input_name = ort.InferenceSession(str(fp32_path), providers=["CPUExecutionProvider"]).get_inputs()[0].name
+    reader = ImageCalibrationReader(calib_images, input_name, imgsz)
+    print(f"Calibrating on {len(calib_images)} images...")
+    quantize_static(
+        str(fp32_path),
+        str(int8_path),
+        reader,
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        calibrate_method=CalibrationMethod.MinMax,
+    )
+    return int8_path
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the quantization tool.
+
+    Returns:
+        argparse.Namespace: An object containing the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="INT8 post-training quantization of the plate detector.")
+    parser.add_argument("--model", default=str(DEFAULT_WEIGHTS), help="Path to the .pt weights (or an FP32 .onnx).")
+    parser.add_argument("--calib", type=Path, default=DEFAULT_CALIB_DIR,
+                        help="Folder of calibration images. Must not overlap the --eval split.")
+    parser.add_argument("--calib-count", type=int, default=DEFAULT_CALIB_COUNT,
+                        help="Number of calibration images, spread over the folder (0 uses all of them).")
+    parser.add_argument("--eval", type=Path, default=DEFAULT_EVAL_DIR,
+                        help="YOLO-format split (images/ + labels/) used to measure mAP drift.")
+    parser.add_argument("--output", type=Path, help="Path of the INT8 model. Defaults to <FP32 export>_int8.onnx.")
+    parser.add_argument("--imgsz", type=int, default=640, help="Detector input size.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    model = Path(args.model)
+    fp32_path = model if model.suffix == ".onnx" else export_detector(model, "onnx", args.imgsz)
+    int8_path = args.output or fp32_path.with_name(f"{fp32_path.stem}_int8.onnx")
+
+    calib_images = sample_images(list_images(args.calib), args.calib_count)
+    if not calib_images:
+        sys.exit(f"[ERROR] No calibration images found in: {args.calib}")
+    eval_images = list_images(args.eval / "images")
+    shared = overlapping_images(calib_images, eval_images)
+    if shared:
+        sys.exit(f"[ERROR] {len(shared)} calibration image(s) also belong to the evaluation split {args.eval} "
+                 f"(e.g. {shared[0].name}). Calibrate on a disjoint split such as dataset/train.")
+    quantize_detector(fp32_path, int8_path, calib_images, args.imgsz)
+    print(f"INT8 model saved to: {int8_path}")
+
+    # --- Compare accuracy and speed against the FP32 model ---
+    fp32 = OnnxDetector(fp32_path, imgsz=args.imgsz)
+    int8 = OnnxDetector(int8_path, imgsz=args.imgsz)
+    frames = [f for f in (cv2.imread(str(p)) for p in eval_images) if f is not None]
+
+    map_fp32, map_int8 = evaluate_map(fp32, args.eval), evaluate_map(int8, args.eval)
+    speed_fp32, speed_int8 = measure_latency(fp32, frames), measure_latency(int8, frames)
+    speedup = speed_fp32["mean"] / speed_int8["mean"] if speed_int8["mean"] else 0.0
+
+    print(f"mAP@0.5   FP32: {map_fp32:.4f}   INT8: {map_int8:.4f}   drift: {map_int8 - map_fp32:+.4f}")
+    print(f"Latency   FP32: {speed_fp32['mean']:.1f} ms   INT8: {speed_int8['mean']:.1f} ms   speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
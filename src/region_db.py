@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+# region_db.py
+#
+# Description:
+# Compact, memory-mapped region database. The region code dictionary is
+# compiled into a binary file that every process maps read-only, so the pages
+# are shared by all workers instead of each process holding its own copy of
+# thousands of small strings.
+#
+# File layout (little-endian):
+#   header   magic "PLATERGN", version (u32), entry count (u32), pool size (u32), CRC-32 of the rest (u32),
+#            source digest (16 bytes: SHA-256 prefix of region_codes.py, or zeros for a JSON build)
+#   keys     sorted 4-byte keys: prefix padded to 2 bytes, suffix char or NUL, NUL
+#   values   one per key: string offset (u32), string length (u16), padding (2 bytes)
+#   pool     UTF-8 region names, each distinct name stored once
+# Keys sit in their own column so a lookup is a single C-level `mmap.find`.
+# The entry with an empty suffix holds the general region name of a prefix.
+# The source digest lets the loader notice that region_codes.py was edited
+# after the table was built; a stale table is ignored (with a warning) in favour
+# of the dictionary until it is rebuilt. Tables built --from-json have no digest
+# and are always used.
+#
+# How to Run:
+#   python region_db.py build                         # from region_codes.py
+#   python region_db.py build --from-json codes.json  # update the data without code changes
+#   python region_db.py check                         # validate against region_codes.py
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+# --- Local Module Imports ---
+from regions import UNKNOWN_REGION, RegionIndex
+
+# --- Constants ---
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / "region_codes.bin"
+SOURCE_PATH = Path(__file__).resolve().parent / "region_codes.py"
+MAGIC = b"PLATERGN"
+VERSION = 2
+HEADER = struct.Struct("<8sIIII16s")
+NO_SOURCE = bytes(16)
+KEY_SIZE = 4
+VALUE = struct.Struct("<IH2x")
+
+
+def encode_key(prefix: str, suffix_char: str = "") -> bytes:
+    """Packs a (prefix, suffix char) pair into the 4-byte sortable key."""
+    return prefix.encode("ascii").ljust(2, b"\0") + suffix_char.encode("ascii").ljust(1, b"\0") + b"\0"
+
+
+def source_digest(path: str | Path = SOURCE_PATH) -> bytes:
+    """Returns the 16-byte digest of the region_codes.py source that the table records."""
+    return hashlib.sha256(Path(path).read_bytes()).digest()[:16]
+
+
+def build_database(detailed_codes: dict, path: str | Path = DEFAULT_DB_PATH, digest: bytes = NO_SOURCE) -> Path:
+    """
+    Compiles a region dictionary into the binary table.
+
+    Args:
+        detailed_codes (dict): {prefix: {"default": region, suffix_char: city, ...}}.
+        path (str | Path): The output file. It is replaced atomically.
+        digest (bytes): `source_digest()` of the file the dictionary came from, or
+                        `NO_SOURCE` if it did not come from region_codes.py.
+
+    Returns:
+        Path: The written file.
+
+    Raises:
+        ValueError: If a prefix or suffix does not fit the key format.
+    """
+    records = []
+    for prefix, region_data in detailed_codes.items():
+        if not (1 <= len(prefix) <= 2 and prefix.isascii() and prefix.isalpha()):
+            raise ValueError(f"Invalid region prefix '{prefix}'.")
+        records.append((encode_key(prefix), region_data.get("default", f"Wilayah {prefix}")))
+        for suffix_char, city in region_data.items():
+            if suffix_char == "default":
+                continue
+            if not (len(suffix_char) == 1 and suffix_char.isascii() and suffix_char.isalpha()):
+                raise ValueError(f"Invalid suffix '{suffix_char}' for prefix '{prefix}'.")
+            records.append((encode_key(prefix, suffix_char), city))
+    records.sort()
+
+    # Interned string pool: each distinct name is stored once.
+    pool = bytearray()
+    offsets: dict[str, tuple[int, int]] = {}
+    keys, values = bytearray(), bytearray()
+    for key, name in records:
+        if name not in offsets:
+            data = name.encode("utf-8")
+            offsets[name] = (len(pool), len(data))
+            pool += data
+        keys += key
+        values += VALUE.pack(*offsets[name])
+
+    body = bytes(keys) + bytes(values) + bytes(pool)
+    header = HEADER.pack(MAGIC, VERSION, len(records), len(pool), zlib.crc32(body), digest)
+    path = Path(path)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(header + body)
+    os.replace(tmp, path)
+    return path
+
+
+class RegionDatabase(RegionIndex):
+    """
+    Read-only, memory-mapped region table with the same lookups as `RegionIndex`.
+    Only the key range of each prefix (a few dozen integers) is read up front;
+    keys are searched and names decoded inside the mapping.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_DB_PATH):
+        """
+        Args:
+            path (str | Path): The compiled table from `build_database`.
+
+        Raises:
+            OSError: If the file cannot be opened.
+            ValueError: If the file is not a valid region table.
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f"{self.path} is too small to be a region table.")
+        magic, version, count, pool_size, crc, digest = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{self.path} is not a version {VERSION} region table.")
+        self.source_digest = digest
+        self._count = count
+        self._keys_end = HEADER.size + count * KEY_SIZE
+        self._pool_start = self._keys_end + count * VALUE.size
+        if len(self._mm) != self._pool_start + pool_size:
+            raise ValueError(f"{self.path} is truncated.")
+        if zlib.crc32(self._mm[HEADER.size:]) != crc:
+            raise ValueError(f"{self.path} is corrupted (checksum mismatch).")
+        # Keys are sorted, so each prefix owns one contiguous byte range of the key column.
+        self._ranges: dict[str, tuple[int, int]] = {}
+        for idx in range(count):
+            prefix = self._key(idx)[:2].rstrip(b"\0").decode("ascii")
+            start = self._ranges.get(prefix, (HEADER.size + idx * KEY_SIZE,))[0]
+            self._ranges[prefix] = (start, HEADER.size + (idx + 1) * KEY_SIZE)
+
+    def _key(self, idx: int) -> bytes:
+        start = HEADER.size + idx * KEY_SIZE
+        return self._mm[start:start + KEY_SIZE]
+
+    def _name(self, idx: int) -> str:
+        offset, length = VALUE.unpack_from(self._mm, self._keys_end + idx * VALUE.size)
+        start = self._pool_start + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def get(self, prefix: str, suffix_char: str = "") -> str | None:
+        """Returns the name stored for (prefix, suffix char), or None."""
+        key_range = self._ranges.get(prefix)
+        if key_range is None or len(suffix_char) > 1 or not suffix_char.isascii():
+            return None
+        key = encode_key(prefix, suffix_char)
+        pos = self._mm.find(key, *key_range)
+        while pos != -1 and (pos - HEADER.size) % KEY_SIZE:
+            # A match straddling two keys; keep searching from the next byte.
+            pos = self._mm.find(key, pos + 1, key_range[1])
+        if pos == -1:
+            return None
+        return self._name((pos - HEADER.size) // KEY_SIZE)
+
+    @property
+    def prefixes(self) -> frozenset[str]:
+        return frozenset(self._ranges)
+
+    def region_prefix(self, prefix_letters: str) -> str:
+        if prefix_letters[:2] in self._ranges:
+            return prefix_letters[:2]
+        if prefix_letters[:1] in self._ranges:
+            return prefix_letters[:1]
+        return ""
+
+    def lookup_parts(self, prefix_letters: str, suffix: str) -> str:
+        prefix = self.region_prefix(prefix_letters)
+        if not prefix:
+            return UNKNOWN_REGION
+        return (suffix and self.get(prefix, suffix[:1])) or self.get(prefix)
+
+    def to_dict(self) -> dict:
+        """Decodes the whole table back into the {prefix: {"default": ..., suffix: ...}} form."""
+        codes: dict[str, dict[str, str]] = {}
+        for idx in range(self._count):
+            key = self._key(idx)
+            prefix = key[:2].rstrip(b"\0").decode("ascii")
+            suffix_char = key[2:3].rstrip(b"\0").decode("ascii") or "default"
+            codes.setdefault(prefix, {})[suffix_char] = self._name(idx)
+        return codes
+
+    def validate_against(self, detailed_codes: dict) -> list[str]:
+        """
+        Compares the table with a region dictionary.
+
+        Returns:
+            list[str]: A description of every difference (empty if the table matches).
+        """
+        expected = {
+            prefix: {"default": data.get("default", f"Wilayah {prefix}"), **data}
+            for prefix, data in detailed_codes.items()
+        }
+        actual = self.to_dict()
+        problems = []
+        for prefix in sorted(set(expected) | set(actual)):
+            want, have = expected.get(prefix, {}), actual.get(prefix, {})
+            for suffix_char in sorted(set(want) | set(have)):
+                if want.get(suffix_char) != have.get(suffix_char):
+                    problems.append(f"{prefix}/{suffix_char}: expected {want.get(suffix_char)!r}, "
+                                    f"found {have.get(suffix_char)!r}")
+        return problems
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def load_region_index(path: str | Path = DEFAULT_DB_PATH) -> RegionIndex:
+    """
+    Maps the compiled region table, falling back to the reference dictionary.
+
+    Args:
+        path (str | Path): The compiled table.
+
+    Returns:
+        RegionIndex: A `RegionDatabase`, or, if the file is missing, invalid, or older
+                     than region_codes.py, a `RegionIndex` built from region_codes.py
+                     (with a warning).
+    """
+    try:
+        db = RegionDatabase(path)
+        if db.source_digest != NO_SOURCE and db.source_digest != source_digest():
+            db.close()
+            raise ValueError(f"{path} was built from an older region_codes.py")
+        return db
+    except (OSError, ValueError) as e:
+        from region_codes import detailed_city_code_dict
+
+        print(f"[WARNING] Cannot map region table ({e}); using region_codes.py. "
+              f"Run `python region_db.py build` to create it.")
+        return RegionIndex(detailed_city_code_dict)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the region table tool.
+
+    Returns:
+        argparse.Namespace: An object containing the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Build or check the memory-mapped region table.")
+    parser.add_argument("command", choices=("build", "check"), help="'build' writes the table, 'check' validates it.")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help="Path of the compiled table.")
+    parser.add_argument("--from-json", type=Path,
+                        help="Region codes as JSON ({prefix: {\"default\": ..., suffix: city}}). "
+                             "Defaults to the dictionary in region_codes.py.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.from_json:
+        try:
+            codes = json.loads(args.from_json.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            sys.exit(f"[ERROR] Cannot read region codes from {args.from_json}. Details: {e}")
+    else:
+        from region_codes import detailed_city_code_dict as codes
+
+    if args.command == "build":
+        try:
+            build_database(codes, args.db, NO_SOURCE if args.from_json else source_digest())
+        except ValueError as e:
+            sys.exit(f"[ERROR] {e}")
+
+    try:
+        db = RegionDatabase(args.db)
+    except (OSError, ValueError) as e:
+        sys.exit(f"[ERROR] Invalid region table. Details: {e}")
+    problems = db.validate_against(codes)
+    if problems:
+        for problem in problems[:20]:
+            print(f"  [MISMATCH] {problem}")
+        sys.exit(f"[ERROR] {args.db} differs from the region codes in {len(problems)} place(s).")
+    size = args.db.stat().st_size
+    print(f"{args.db}: {len(db)} entries, {len(db.prefixes)} prefixes, {size} bytes, matches the region codes.")
+
+
+if __name__ == "__main__":
+    main()
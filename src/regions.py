@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# regions.py
+#
+# Description:
+# Compiled region-code index for Indonesian plates. `get_detailed_city_from_code`,
+# the original lookup of main.py kept here as the reference implementation,
+# cleans the text with `re.sub`, probes the dictionary twice, and runs
+# `re.search(r'\d+([A-Z])')` for every plate. `RegionIndex` gives the same
+# answers with:
+#   - a single-pass parser (no regex) that splits a plate into its prefix
+#     letters, number, and suffix letters;
+#   - one flat lookup table keyed by (prefix, suffix char).
+# Each lookup is O(len(plate)) plus two hash probes. `plate_category` likewise
+# replaces the regex of `get_plate_category`, also kept here as a reference.
+#
+# How to Run (micro-benchmark against get_detailed_city_from_code):
+#   python regions.py
+#   python regions.py --number 200000
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import re
+import sys
+import timeit
+
+# --- Constants ---
+LETTERS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+DIGITS = frozenset("0123456789")
+UNKNOWN_REGION = "Unknown"
+
+
+def split_plate(plate_txt: str) -> tuple[str, str, str]:
+    """
+    Splits a plate into its letter prefix, number, and letter suffix in one pass.
+
+    Characters other than A-Z and 0-9 (spaces, dashes, OCR padding) are skipped,
+    and parsing stops at the first digit after the suffix.
+
+    Args:
+        plate_txt (str): The recognized plate text, e.g. "b 1234 xyz".
+
+    Returns:
+        tuple[str, str, str]: (prefix, number, suffix), e.g. ("B", "1234", "XYZ").
+                              Parts that are not present are empty strings.
+    """
+    prefix = number = suffix = ""
+    for ch in plate_txt.upper():
+        if ch in LETTERS:
+            if number:
+                suffix += ch
+            else:
+                prefix += ch
+        elif ch in DIGITS:
+            if suffix:
+                break
+            number += ch
+    return prefix, number, suffix
+
+
+def plate_category(plate_txt: str) -> str:
+    """
+    Odd/even category from the last digit of the plate, without regex. Same result
+    as `get_plate_category(plate_txt)`.
+
+    Returns:
+        str: "Ganjil", "Genap", "No Number" if no digits are found, or "" for empty text.
+    """
+    if not plate_txt:
+        return ""
+    for ch in reversed(plate_txt):
+        if ch.isdecimal():  # Same characters as the regex \d.
+            return "Genap" if int(ch) % 2 == 0 else "Ganjil"
+    return "No Number"
+
+
+class RegionIndex:
+    """
+    Flat (prefix, suffix char) -> region table built from a region dictionary
+    such as `detailed_city_code_dict`.
+    """
+
+    def __init__(self, detailed_codes: dict):
+        """
+        Args:
+            detailed_codes (dict): {prefix: {"default": region, suffix_char: city, ...}}.
+        """
+        # (prefix, "") holds the general region name of a prefix.
+        self.table: dict[tuple[str, str], str] = {}
+        for prefix, region_data in detailed_codes.items():
+            self.table[(prefix, "")] = region_data.get("default", f"Wilayah {prefix}")
+            for suffix_char, city in region_data.items():
+                if suffix_char != "default":
+                    self.table[(prefix, suffix_char)] = city
+        self.prefixes = frozenset(detailed_codes)
+
+    def get(self, prefix: str, suffix_char: str = "") -> str | None:
+        """Returns the name stored for (prefix, suffix char), or None."""
+        return self.table.get((prefix, suffix_char))
+
+    def region_prefix(self, prefix_letters: str) -> str:
+        """Returns the registered region code of a plate prefix (2 letters first, then 1), or ""."""
+        if prefix_letters[:2] in self.prefixes:
+            return prefix_letters[:2]
+        if prefix_letters[:1] in self.prefixes:
+            return prefix_letters[:1]
+        return ""
+
+    def lookup_parts(self, prefix_letters: str, suffix: str) -> str:
+        """Returns the city/region of an already split plate, or "Unknown"."""
+        prefix = self.region_prefix(prefix_letters)
+        if not prefix:
+            return UNKNOWN_REGION
+        return self.table.get((prefix, suffix[:1])) or self.table[(prefix, "")]
+
+    def lookup(self, plate_txt: str) -> str:
+        """
+        Finds the specific city/regency of a plate. Same result as
+        `get_detailed_city_from_code(plate_txt, detailed_codes)`.
+
+        Args:
+            plate_txt (str): The recognized license plate text.
+
+        Returns:
+            str: The name of the city/region, or "Unknown" if not found.
+        """
+        prefix_letters, _, suffix = split_plate(plate_txt)
+        return self.lookup_parts(prefix_letters, suffix)
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+
+# -----------------------------------------------------------------------------
+# MICRO-BENCHMARK
+# -----------------------------------------------------------------------------
+def get_detailed_city_from_code(plate_txt: str, detailed_codes: dict) -> str:
+    """
+    Reference implementation, used only to check and benchmark `RegionIndex`.
+
+    Finds the specific city/regency from the license plate text by looking up
+    its prefix and suffix in the provided dictionary.
+
+    Args:
+        plate_txt (str): The recognized license plate text.
+        detailed_codes (dict): The dictionary mapping codes to regions.
+
+    Returns:
+        str: The name of the city/region, or "Unknown" if not found.
+    """
+    # 1. Sanitize the plate text to keep only uppercase letters and numbers.
+    clean_plate = re.sub(r'[^A-Z0-9]', '', plate_txt.upper())
+    if not clean_plate:
+        return "Unknown"
+
+    # 2. Identify the main region prefix (e.g., "AA", "B", "D").
+    # We check for 2-letter prefixes first to avoid false matches (e.g., matching 'B' in 'BL').
+    prefix = ""
+    if len(clean_plate) >= 2 and clean_plate[:2] in detailed_codes:
+        prefix = clean_plate[:2]
+    elif clean_plate and clean_plate[0] in detailed_codes:
+        prefix = clean_plate[0]
+
+    if not prefix:
+        return "Unknown"
+
+    # 3. Find the first letter of the suffix (the first letter after the number block).
+    # Corrected Regex: \d+ matches one or more digits.
+    match = re.search(r'\d+([A-Z])', clean_plate)
+    suffix_char = match.group(1) if match else ""
+
+    # 4. Look up the region in the dictionary.
+    region_data = detailed_codes.get(prefix, {})
+    # Get the general region name as a fallback.
+    general_region_name = region_data.get("default", f"Wilayah {prefix}")
+
+    # If a suffix character was found, try to get the specific city.
+    # Otherwise, or if the specific city isn't listed, return the general name.
+    if suffix_char:
+        return region_data.get(suffix_char, general_region_name)
+
+    return general_region_name
+
+
+def get_plate_category(plate_txt: str) -> str:
+    """
+    Reference implementation, used only to check `plate_category`.
+
+    Determines if a license plate is 'Ganjil' (odd) or 'Genap' (even)
+    based on the last digit of its number.
+
+    Args:
+        plate_txt (str): The recognized license plate text.
+
+    Returns:
+        str: "Ganjil", "Genap", "No Number" if no digits are found, or "Invalid".
+    """
+    if not plate_txt:
+        return ""
+
+    # Corrected Regex: Find all digits (\d) in the string.
+    digits = re.findall(r'\d', plate_txt)
+
+    if not digits:
+        return "No Number"
+
+    # The category is determined by the very last digit found.
+    try:
+        last_digit = int(digits[-1])
+        return "Genap" if last_digit % 2 == 0 else "Ganjil"
+    except (ValueError, IndexError):
+        return "Invalid"
+
+
+def sample_plates(detailed_codes: dict) -> list[str]:
+    """
+    Builds plate texts covering every (prefix, suffix) entry, plus the usual OCR noise:
+    lowercase, separators, unknown suffixes and prefixes, and garbage.
+    """
+    plates = []
+    for i, (prefix, region_data) in enumerate(sorted(detailed_codes.items())):
+        for suffix_char in region_data:
+            if suffix_char != "default":
+                plates.append(f"{prefix} {1000 + i * 7} {suffix_char}X")
+        plates += [f"{prefix}{i}", f"{prefix.lower()}-{i}-q", f"{prefix}{i}{i}"]
+    plates += ["", "1234", "??", "XQ 12 AB", "B12C34D", "_b1234xyz_"]
+    return plates
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parses command-line arguments for the micro-benchmark.
+
+    Returns:
+        argparse.Namespace: An object containing the parsed arguments.
+    """
+    parser = argparse.ArgumentParser(description="Micro-benchmark of RegionIndex against get_detailed_city_from_code.")
+    parser.add_argument("--number", type=int, default=20, help="Timed passes over all sample plates.")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions; the best one is reported.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    from region_codes import detailed_city_code_dict
+
+    index = RegionIndex(detailed_city_code_dict)
+    plates = sample_plates(detailed_city_code_dict)
+    mismatched = [p for p in plates if index.lookup(p) != get_detailed_city_from_code(p, detailed_city_code_dict)]
+    if mismatched:
+        sys.exit(f"[ERROR] RegionIndex disagrees with get_detailed_city_from_code on: {mismatched[:10]}")
+    mismatched = [p for p in plates if plate_category(p) != get_plate_category(p)]
+    if mismatched:
+        sys.exit(f"[ERROR] plate_category disagrees with get_plate_category on: {mismatched[:10]}")
+
+    def reference():
+        for plate in plates:
+            get_detailed_city_from_code(plate, detailed_city_code_dict)
+
+    def compiled():
+        for plate in plates:
+            index.lookup(plate)
+
+    calls = len(plates) * args.number
+    old = min(timeit.repeat(reference, number=args.number, repeat=args.repeat)) / calls
+    new = min(timeit.repeat(compiled, number=args.number, repeat=args.repeat)) / calls
+    print(f"{len(plates)} sample plates, {len(index)} table entries, identical results.")
+    print(f"get_detailed_city_from_code: {old * 1e9:8.0f} ns/plate")
+    print(f"RegionIndex.lookup:          {new * 1e9:8.0f} ns/plate   ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
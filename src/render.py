@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# render.py
+#
+# Description:
+# Cached overlay rendering. The overlay text repeats endlessly ("Tipe: Genap",
+# "Wilayah: Kota Medan", ...) and always uses the same font and scale, so:
+#   - text sizes are memoized instead of calling `cv2.getTextSize` per box;
+#   - each label block (background + lines of text) is rasterized once into a
+#     sprite with an alpha mask, kept in an LRU cache, and alpha-blitted onto
+#     the frame.
+# The result matches the direct `cv2.rectangle` / `cv2.putText` drawing. Text
+# that changes every frame (the FPS counter) is drawn directly instead, so it
+# does not churn the cache and evict the plate labels.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import functools
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+# --- Third-Party Library Imports ---
+import cv2
+import numpy as np
+
+
+@functools.lru_cache(maxsize=4096)
+def text_size(text: str, font: int, scale: float, thickness: int) -> tuple[int, int, int]:
+    """
+    Memoized `cv2.getTextSize`.
+
+    Returns:
+        tuple[int, int, int]: Width, height (above the baseline), and baseline offset, in pixels.
+    """
+    (width, height), baseline = cv2.getTextSize(text, font, scale, thickness)
+    return width, height, baseline
+
+
+class Sprite(NamedTuple):
+    """A pre-rendered overlay image."""
+    bgr: np.ndarray              # (H, W, 3) colors.
+    alpha: np.ndarray            # (H, W, 1) float32 opacity in [0, 1].
+    offset: tuple[int, int]      # Top-left corner relative to the drawing anchor.
+
+
+def blit(frame: np.ndarray, sprite: Sprite, x: int, y: int) -> None:
+    """
+    Alpha-blends a sprite onto a frame in place, clipped to the frame borders.
+
+    Args:
+        frame (np.ndarray): The BGR frame.
+        sprite (Sprite): The sprite to draw.
+        x (int): Anchor x; the sprite's top-left corner is at `x + sprite.offset[0]`.
+        y (int): Anchor y; the sprite's top-left corner is at `y + sprite.offset[1]`.
+    """
+    left, top = x + sprite.offset[0], y + sprite.offset[1]
+    height, width = sprite.bgr.shape[:2]
+    fx1, fy1 = max(left, 0), max(top, 0)
+    fx2, fy2 = min(left + width, frame.shape[1]), min(top + height, frame.shape[0])
+    if fx1 >= fx2 or fy1 >= fy2:
+        return
+    sx1, sy1 = fx1 - left, fy1 - top
+    sx2, sy2 = sx1 + (fx2 - fx1), sy1 + (fy2 - fy1)
+    roi = frame[fy1:fy2, fx1:fx2]
+    alpha = sprite.alpha[sy1:sy2, sx1:sx2]
+    roi[:] = (roi * (1.0 - alpha) + sprite.bgr[sy1:sy2, sx1:sx2] * alpha).astype(np.uint8)
+
+
+class LabelRenderer:
+    """Draws label blocks and overlay text from an LRU cache of sprites."""
+
+    def __init__(
+        self,
+        font: int = cv2.FONT_HERSHEY_SIMPLEX,
+        scale: float = 0.6,
+        thickness: int = 2,
+        text_color: tuple[int, int, int] = (0, 0, 0),
+        bg_color: tuple[int, int, int] = (0, 255, 0),
+        max_sprites: int = 512,
+    ):
+        """
+        Args:
+            font (int): OpenCV Hershey font of the label blocks.
+            scale (float): Font scale of the label blocks.
+            thickness (int): Stroke thickness of the label blocks.
+            text_color (tuple): BGR color of the label text.
+            bg_color (tuple): BGR color of the label background.
+            max_sprites (int): Maximum number of cached sprites; the least recently used are evicted.
+        """
+        self.font = font
+        self.scale = scale
+        self.thickness = thickness
+        self.text_color = text_color
+        self.bg_color = bg_color
+        self.max_sprites = max_sprites
+        self._sprites: OrderedDict[tuple, Sprite] = OrderedDict()
+        self._lock = threading.Lock()  # Streams of the multi-camera mode share one renderer.
+
+        # Cache counters.
+        self.hits = 0
+        self.misses = 0
+
+    def line_height(self) -> int:
+        return text_size("A", self.font, self.scale, self.thickness)[1] + 10
+
+    def _cached(self, key: tuple, build) -> Sprite:
+        with self._lock:
+            sprite = self._sprites.get(key)
+            if sprite is not None:
+                self._sprites.move_to_end(key)
+                self.hits += 1
+                return sprite
+        sprite = build()
+        with self._lock:
+            self.misses += 1
+            self._sprites[key] = sprite
+            while len(self._sprites) > self.max_sprites:
+                self._sprites.popitem(last=False)
+        return sprite
+
+    def _build_labels(self, labels: tuple[str, ...]) -> Sprite:
+        # Same layout as the direct drawing: a filled background whose bottom edge is the
+        # anchor row, with one line of text every `line_height` pixels and a 5 px margin.
+        line_height = self.line_height()
+        sizes = [text_size(label, self.font, self.scale, self.thickness) for label in labels]
+        bg_height = line_height * len(labels) + 6
+        bg_width = max((w for w, _, _ in sizes), default=0) + 11
+        # Descenders of the last line may hang below the background, as with cv2.putText.
+        height = bg_height + max((b for _, _, b in sizes), default=0) + self.thickness
+
+        bgr = np.zeros((height, bg_width, 3), dtype=np.uint8)
+        mask = np.zeros((height, bg_width), dtype=np.uint8)
+        bgr[:bg_height] = self.bg_color
+        mask[:bg_height] = 255
+        for i, label in enumerate(labels):
+            origin = (5, line_height * (i + 1))
+            cv2.putText(bgr, label, origin, self.font, self.scale, self.text_color, self.thickness, cv2.LINE_AA)
+            cv2.putText(mask, label, origin, self.font, self.scale, 255, self.thickness, cv2.LINE_AA)
+        alpha = (mask.astype(np.float32) / 255.0)[:, :, None]
+        return Sprite(bgr, alpha, (0, -(bg_height - 1)))
+
+    def draw_labels(self, frame: np.ndarray, x: int, y: int, labels: list[str]) -> None:
+        """
+        Draws a block of label lines whose bottom-left corner is (x, y), e.g. the top-left of a plate box.
+
+        Args:
+            frame (np.ndarray): The BGR frame, drawn in place.
+            x (int): Left edge of the block.
+            y (int): Bottom edge of the block.
+            labels (list[str]): The lines, top to bottom.
+        """
+        key = ("labels",) + tuple(labels)
+        blit(frame, self._cached(key, lambda: self._build_labels(tuple(labels))), x, y)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# stats.py
+#
+# Description:
+# Per-stage latency instrumentation for the processing loop. Every stage
+# (read, predict, crop, ocr, lookup, draw, output) is timed with the monotonic
+# `time.perf_counter()`. Each stage keeps:
+#   - a rolling window of recent samples, for p50/p95/p99 in periodic summaries;
+#   - cumulative histogram buckets, a sum and a count, for the metrics exporter.
+# A periodic summary and a final report show which stage limits throughput.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import bisect
+import contextlib
+import time
+from collections import deque
+
+# --- Constants ---
+STAGES = ("read", "predict", "crop", "ocr", "lookup", "draw", "output")
+# Upper bounds of the histogram buckets, in seconds (Prometheus-style "le" buckets).
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    """Returns the q-th percentile (0-100) of already sorted samples, by nearest rank."""
+    if not sorted_samples:
+        return 0.0
+    idx = min(len(sorted_samples) - 1, max(0, round(q / 100 * (len(sorted_samples) - 1))))
+    return sorted_samples[idx]
+
+
+class LatencyHistogram:
+    """
+    Latency samples of one stage. Written by a single thread; readers only
+    copy plain numbers, so no lock is needed.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)  # Last bucket is +Inf.
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentiles(self) -> dict[str, float]:
+        """Returns p50/p95/p99 of the rolling window, in seconds."""
+        ordered = sorted(self.samples)
+        return {"p50": percentile(ordered, 50), "p95": percentile(ordered, 95), "p99": percentile(ordered, 99)}
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class StageStats:
+    """Collects latency histograms for every stage of the processing loop."""
+
+    def __init__(self, report_interval: float = 0.0, window: int = 1000):
+        """
+        Args:
+            report_interval (float): Seconds between periodic summaries (0 disables them).
+            window (int): Number of recent samples per stage used for percentiles.
+        """
+        self.histograms: dict[str, LatencyHistogram] = {stage: LatencyHistogram(window) for stage in STAGES}
+        self.window = window
+        self.report_interval = report_interval
+        self.frames = 0
+        # Event counters (e.g. "detections", "events"), read by the metrics exporter.
+        self.counters: dict[str, int] = {}
+        self.started = time.perf_counter()
+        self._frame_times: deque[float] = deque(maxlen=60)
+        self._last_report = self.started
+
+    @contextlib.contextmanager
+    def time(self, stage: str, frames: int = 1):
+        """
+        Times a block of code as one stage.
+
+        Args:
+            stage (str): The stage name.
+            frames (int): Number of frames processed by the block; the time is split evenly
+                          between them so batched stages stay comparable to per-frame ones.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, frames)
+
+    def record(self, stage: str, seconds: float, frames: int = 1) -> None:
+        """Adds one per-frame sample of `seconds / frames` to a stage."""
+        if stage not in self.histograms:
+            self.histograms[stage] = LatencyHistogram(self.window)
+        self.histograms[stage].add(seconds / max(1, frames))
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Adds `n` to an event counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def frame_done(self) -> None:
+        """Marks the end of a frame; used for the rolling FPS and the periodic summary."""
+        now = time.perf_counter()
+        self.frames += 1
+        self._frame_times.append(now)
+        if self.report_interval and now - self._last_report >= self.report_interval:
+            self._last_report = now
+            print(self.summary())
+
+    @property
+    def fps(self) -> float:
+        """Frames per second over the last 60 frames."""
+        if len(self._frame_times) < 2:
+            return 0.0
+        return (len(self._frame_times) - 1) / (self._frame_times[-1] - self._frame_times[0])
+
+    def summary(self, title: str = "Stage latency") -> str:
+        """
+        Formats a table of per-stage latencies (in milliseconds per frame).
+
+        Returns:
+            str: The table, with the slowest stage (by p50) marked.
+        """
+        rows = [(stage, h.percentiles(), h.mean) for stage, h in self.histograms.items() if h.count]
+        elapsed = time.perf_counter() - self.started
+        lines = [f"--- {title}: {self.frames} frames, {self.frames / elapsed if elapsed else 0:.1f} FPS average ---"]
+        if not rows:
+            return lines[0]
+        slowest = max(rows, key=lambda row: row[1]["p50"])[0]
+        lines.append(f"{'stage':<10}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}  (ms/frame)")
+        for stage, pct, mean in rows:
+            marker = "  <- bottleneck" if stage == slowest else ""
+            lines.append(f"{stage:<10}{mean * 1000:>9.2f}{pct['p50'] * 1000:>9.2f}"
+                         f"{pct['p95'] * 1000:>9.2f}{pct['p99'] * 1000:>9.2f}{marker}")
+        return "\n".join(lines)
+
+
+class NullStats:
+    """Drop-in replacement for `StageStats` that records nothing."""
+
+    def time(self, stage: str, frames: int = 1):
+        return contextlib.nullcontext()
+
+    def record(self, stage: str, seconds: float, frames: int = 1) -> None:
+        pass
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def frame_done(self) -> None:
+        pass
+
+
+NULL_STATS = NullStats()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python
+# supervisor.py
+#
+# Description:
+# Multi-camera mode: runs many video sources from a single process. The YOLO
+# detector and the OCR model are loaded once and shared by all streams, instead
+# of one `main.py` process (and one copy of each model) per camera.
+#
+#   - Each stream has its own capture thread, tracker, OCR policy, motion gate,
+#     ROI polygons, and output video.
+#   - Detection requests of all streams go through one `DetectionBatcher`. Each
+#     stream has at most one frame in flight, so every batch takes at most one
+#     frame per stream: scheduling is round-robin and no camera can starve the others.
+#
+# Stream config file (JSON):
+#   {
+#     "streams": [
+#       {"name": "gate-1", "source": "rtsp://10.0.0.11/stream", "save": "out/gate-1.mp4"},
+#       {"name": "gate-2", "source": "videos/gate-2.mp4",
+#        "roi": [[[0, 300], [640, 250], [640, 480], [0, 480]]], "motion": "diff"}
+#     ]
+#   }
+# Optional per-stream keys: "save", "roi", "capture_policy", "motion", "motion_roi".
+#
+# How to Run:
+#   python main.py --config cameras.json
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import argparse
+import json
+import signal
+import sys
+import threading
+from pathlib import Path
+
+# --- Third-Party Library Imports ---
+import cv2
+
+# --- Local Module Imports ---
+from batching import BatchedDetector, DetectionBatcher
+from capture import FrameGrabber, resolve_capture_policy
+from events import make_event
+from main import open_event_writer, process_frame, region_index, report_finished
+from metrics import MetricsExporter
+from motion import MotionGate, gated_detect, parse_roi
+from ocr_batch import read_plates
+from ocr_policy import OcrPolicy
+from plate_format import PlateFormat
+from roi import RoiDetector, parse_polygons
+from stats import StageStats
+from tracker import PlateTracker
+from video_writer import AsyncVideoWriter
+
+
+def load_stream_configs(path: str | Path) -> list[dict]:
+    """
+    Reads and validates the stream list of a config file.
+
+    Args:
+        path (str | Path): The JSON config file.
+
+    Returns:
+        list[dict]: One dict per stream, each with at least "name" and "source".
+
+    Raises:
+        ValueError: If a stream has no source or two streams share a name.
+    """
+    streams = json.loads(Path(path).read_text()).get("streams", [])
+    names = set()
+    for idx, stream in enumerate(streams):
+        if "source" not in stream:
+            raise ValueError(f"Stream #{idx} has no 'source'.")
+        stream["source"] = str(stream["source"])
+        stream.setdefault("name", f"stream-{idx}")
+        if stream["name"] in names:
+            raise ValueError(f"Duplicate stream name '{stream['name']}'.")
+        names.add(stream["name"])
+    return streams
+
+
+class StreamWorker(threading.Thread):
+    """Processes one video source with the shared detector and OCR model."""
+
+    def __init__(
+        self,
+        config: dict,
+        batcher: DetectionBatcher,
+        ocr,
+        args: argparse.Namespace,
+        stop: threading.Event,
+        event_writer=None,
+    ):
+        super().__init__(name=f"Stream-{config['name']}", daemon=True)
+        self.config = config
+        self.stream_name = config["name"]
+        self.ocr = ocr
+        self.event_writer = event_writer
+        self.args = args
+        self.stop_event = stop
+
+        # Shared detector, seen through this stream's ROI polygons if any.
+        self.detector = BatchedDetector(batcher)
+        polygons = parse_polygons(config.get("roi", []))
+        if polygons:
+            self.detector = RoiDetector(self.detector, polygons)
+
+        self.tracker = PlateTracker(
+            iou_threshold=args.track_iou,
+            max_age=args.track_ttl,
+            vote_min_reads=args.vote_min_reads,
+            vote_threshold=args.vote_threshold,
+        )
+        self.ocr_policy = OcrPolicy(first_k=args.ocr_first_k, stable_m=args.ocr_stable_m)
+        self.plate_format = None if args.raw_ocr else PlateFormat(region_index)
+        motion = config.get("motion", args.motion)
+        self.motion_gate = None
+        if motion:
+            self.motion_gate = MotionGate(method=motion, roi=parse_roi(config.get("motion_roi")),
+                                          min_changed=args.motion_threshold)
+
+        self.cap = None
+        self.writer = None
+        # Per-stream latencies and counters, read by the metrics exporter.
+        self.stats = StageStats()
+
+    def open(self) -> None:
+        """Opens the capture and the output writer of the stream."""
+        source = self.config["source"]
+        cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+        if not cap.isOpened():
+            raise OSError(f"Cannot open video source: {source}")
+        policy = resolve_capture_policy(source, self.config.get("capture_policy", self.args.capture_policy))
+        self.cap = FrameGrabber(cap, policy=policy, buffer_size=self.args.capture_buffer).start()
+
+        save = self.config.get("save")
+        if save:
+            Path(save).parent.mkdir(parents=True, exist_ok=True)
+            w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+            writer = cv2.VideoWriter(str(save), cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+            self.writer = AsyncVideoWriter(writer, policy=self.args.save_policy, max_queue=self.args.save_queue).start()
+        print(f"[{self.stream_name}] Opened {source} (capture policy: {policy}).")
+
+    def run(self) -> None:
+        try:
+            while not self.stop_event.is_set():
+                ok, frame = self.cap.read(timeout=0.5)
+                if not ok:
+                    if self.cap.finished:
+                        print(f"[{self.stream_name}] End of video stream.")
+                        break
+                    continue
+                with self.stats.time("predict"):
+                    detections = gated_detect(self.detector, [frame], self.args.conf, self.motion_gate)
+                self.stats.count("detections", len(detections[0].xyxy))
+                tracks = [self.tracker.update(detections[0].xyxy)]
+                texts = read_plates(self.ocr, [frame], detections, self.args.ocr_batch, tracks, self.ocr_policy,
+                                    self.stats, self.plate_format)
+                # Streams without an output video are headless: nothing is drawn.
+                reported = process_frame(frame, detections[0], tracks[0], texts[0], stream_name=self.stream_name,
+                                         stats=self.stats, draw=self.writer is not None)
+                # Plates whose track was evicted are reported if the reads so far pass the vote threshold.
+                reported += report_finished(self.tracker.pop_finished(), stream_name=self.stream_name)
+                self.emit(reported)
+                if self.writer:
+                    with self.stats.time("output"):
+                        self.writer.write(frame)
+                self.stats.frame_done()
+            # Plates still in view when the stream ends are reported as well.
+            self.emit(report_finished(self.tracker.flush(), stream_name=self.stream_name))
+        except Exception as e:
+            print(f"[ERROR] [{self.stream_name}] Stream stopped. Details: {e}")
+        finally:
+            self.close()
+
+    def emit(self, reported: list) -> None:
+        """Counts the reported plates and queues their events."""
+        self.stats.count("events", len(reported))
+        if self.event_writer:
+            for track, score in reported:
+                self.event_writer.emit(make_event(track, score, self.stream_name))
+
+    def close(self) -> None:
+        if self.cap:
+            self.cap.release()
+        if self.writer:
+            self.writer.release()
+            self.writer = None
+
+
+def run_supervisor(args: argparse.Namespace, detector, ocr) -> None:
+    """
+    Runs every stream of `args.config` with a shared detector and OCR model.
+
+    Args:
+        args (argparse.Namespace): The parsed main.py arguments, including --config.
+        detector: The loaded plate detector, shared by all streams.
+        ocr: The loaded fast-plate-ocr recognizer, shared by all streams.
+    """
+    try:
+        configs = load_stream_configs(args.config)
+    except (OSError, ValueError) as e:
+        sys.exit(f"[ERROR] Failed to read stream config {args.config}. Details: {e}")
+    if not configs:
+        sys.exit(f"[ERROR] No streams defined in: {args.config}")
+
+    # One batch can hold one frame of every stream.
+    batcher = DetectionBatcher(detector, args.conf, batch_size=max(args.batch_size, len(configs)),
+                               max_wait=args.batch_wait).start()
+    event_writer = open_event_writer(args.events)
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    workers = []
+    for config in configs:
+        try:
+            worker = StreamWorker(config, batcher, ocr, args, stop, event_writer)
+            worker.open()
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] [{config['name']}] {e}")
+            continue
+        workers.append(worker)
+    if not workers:
+        sys.exit("[ERROR] None of the configured streams could be opened.")
+
+    if args.metrics_port:
+        try:
+            exporter = MetricsExporter(args.metrics_port)
+        except OSError as e:
+            sys.exit(f"[ERROR] Cannot serve metrics on port {args.metrics_port}. Details: {e}")
+        for worker in workers:
+            exporter.register(worker.stream_name, stats=worker.stats, capture=worker.cap, tracker=worker.tracker,
+                              ocr_policy=worker.ocr_policy, plate_format=worker.plate_format,
+                              motion_gate=worker.motion_gate, batcher=batcher, event_writer=event_writer,
+                              video_writer=worker.writer)
+        exporter.start()
+
+    print(f"Processing {len(workers)} stream(s)... Press Ctrl+C to stop.")
+    for worker in workers:
+        worker.start()
+    while any(worker.is_alive() for worker in workers):
+        for worker in workers:
+            worker.join(timeout=0.5)
+
+    batcher.stop()
+    if event_writer:
+        event_writer.close()
+    for worker in workers:
+        print(f"[{worker.stream_name}] Frames processed: {worker.stats.frames}, "
+              f"OCR calls saved: {worker.ocr_policy.calls_saved}")
+    print(f"Detection batches: {batcher.batches_run} for {batcher.frames_run} frames.")
+    print("Finished. Bye 👋")
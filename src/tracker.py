@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+# tracker.py
+#
+# Description:
+# A lightweight multi-object tracker for license plate boxes. Detections in
+# consecutive frames are associated by IoU (with a centroid-distance fallback
+# for small or fast-moving plates), so each physical plate keeps one track ID
+# for as long as it is visible. Tracks that are not seen for `max_age` frames
+# are evicted, which keeps memory bounded on 24/7 feeds. Evicted tracks have
+# their OCR vote finalized and are handed back through `pop_finished()`, so a
+# plate that leaves the frame before it has `vote_min_reads` reads is still
+# reported, as long as its reads agree above `vote_threshold`.
+#
+# Dependencies: standard library only.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import itertools
+import math
+from typing import Sequence
+
+# --- Local Module Imports ---
+from consensus import PlateConsensus
+
+Box = Sequence[float]  # (x1, y1, x2, y2) in frame pixel coordinates.
+
+
+def box_iou(a: Box, b: Box) -> float:
+    """
+    Computes the Intersection over Union of two boxes.
+
+    Args:
+        a (Box): The first box as (x1, y1, x2, y2).
+        b (Box): The second box as (x1, y1, x2, y2).
+
+    Returns:
+        float: The IoU in [0, 1].
+    """
+    ix1, iy1 = max(a[0], b[0]), max(a[1], b[1])
+    ix2, iy2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, ix2 - ix1) * max(0.0, iy2 - iy1)
+    if inter <= 0:
+        return 0.0
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / (area_a + area_b - inter)
+
+
+def centroid_distance(a: Box, b: Box) -> float:
+    """
+    Computes the distance between two box centres, normalised by the diagonal
+    of the first box so the threshold does not depend on plate size.
+    """
+    ax, ay = (a[0] + a[2]) / 2, (a[1] + a[3]) / 2
+    bx, by = (b[0] + b[2]) / 2, (b[1] + b[3]) / 2
+    diag = math.hypot(a[2] - a[0], a[3] - a[1]) or 1.0
+    return math.hypot(ax - bx, ay - by) / diag
+
+
+class Track:
+    """State of one physical plate across frames."""
+
+    def __init__(self, track_id: int, box: Box, frame_idx: int, votes: PlateConsensus | None = None):
+        self.track_id = track_id
+        self.box = tuple(float(v) for v in box)
+        self.first_seen = frame_idx
+        self.last_seen = frame_idx
+        self.hits = 1            # Number of frames the plate was detected in.
+        self.text = ""           # Latest plate text read for this track.
+        self.reported = False    # Whether a detection event was already emitted.
+        self.confidence = 0.0    # Detection confidence of the latest box.
+
+        # Multi-frame OCR consensus. Category and city are looked up once, for the final text.
+        self.votes = votes if votes is not None else PlateConsensus()
+        self.category = ""
+        self.city = ""
+
+        # OCR throttling state, maintained by `OcrPolicy`.
+        self.ocr_calls = 0       # Number of crops of this track sent to OCR.
+        self.best_area = 0       # Largest crop area read so far.
+        self.best_sharpness = 0.0
+        self.last_read = ""      # Text returned by the most recent OCR call.
+        self.stable_reads = 0    # Consecutive identical reads.
+        self.ocr_done = False    # True once the read is stable and OCR stops.
+
+    @property
+    def age(self) -> int:
+        """Number of frames since the track was created."""
+        return self.last_seen - self.first_seen + 1
+
+    def __repr__(self) -> str:
+        return f"Track(id={self.track_id}, text={self.text!r}, hits={self.hits})"
+
+
+class PlateTracker:
+    """
+    Associates plate boxes across frames and assigns each physical plate a
+    stable track ID.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = 0.3,
+        max_distance: float = 1.0,
+        max_age: int = 30,
+        vote_min_reads: int = 3,
+        vote_threshold: float = 0.6,
+    ):
+        """
+        Args:
+            iou_threshold (float): Minimum IoU to match a detection to a track.
+            max_distance (float): Maximum centroid distance (in box diagonals) for the
+                                  fallback match when boxes do not overlap enough.
+            max_age (int): Number of frames a track survives without being detected.
+            vote_min_reads (int): Minimum OCR reads before a track's plate text is final.
+            vote_threshold (float): Minimum consensus confidence for a track's plate text.
+        """
+        self.iou_threshold = iou_threshold
+        self.max_distance = max_distance
+        self.max_age = max_age
+        self.vote_min_reads = vote_min_reads
+        self.vote_threshold = vote_threshold
+        self.tracks: dict[int, Track] = {}
+        self.finished: list[Track] = []  # Evicted tracks not yet collected by `pop_finished`.
+        self.frame_idx = -1
+        self._ids = itertools.count(1)
+
+        # Counters, read by the stats/metrics code.
+        self.tracks_created = 0
+        self.tracks_evicted = 0
+
+    def update(self, boxes: Sequence[Box]) -> list[Track]:
+        """
+        Associates the boxes of a new frame with existing tracks.
+
+        Args:
+            boxes (Sequence[Box]): The detected boxes of the frame.
+
+        Returns:
+            list[Track]: The track of each box, in the same order as `boxes`.
+        """
+        self.frame_idx += 1
+        boxes = [tuple(float(v) for v in box) for box in boxes]
+        assigned: list[Track | None] = [None] * len(boxes)
+        free_tracks = set(self.tracks)
+
+        # 1. Greedy IoU matching, best pairs first.
+        pairs = []
+        for det_idx, box in enumerate(boxes):
+            for track_id in free_tracks:
+                iou = box_iou(self.tracks[track_id].box, box)
+                if iou >= self.iou_threshold:
+                    pairs.append((iou, det_idx, track_id))
+        for _, det_idx, track_id in sorted(pairs, reverse=True):
+            if assigned[det_idx] is None and track_id in free_tracks:
+                assigned[det_idx] = self.tracks[track_id]
+                free_tracks.discard(track_id)
+
+        # 2. Centroid fallback for detections that are still unmatched.
+        for det_idx, box in enumerate(boxes):
+            if assigned[det_idx] is not None or not free_tracks:
+                continue
+            track_id = min(free_tracks, key=lambda tid: centroid_distance(self.tracks[tid].box, box))
+            if centroid_distance(self.tracks[track_id].box, box) <= self.max_distance:
+                assigned[det_idx] = self.tracks[track_id]
+                free_tracks.discard(track_id)
+
+        # 3. Update matched tracks and create new ones.
+        for det_idx, box in enumerate(boxes):
+            track = assigned[det_idx]
+            if track is None:
+                votes = PlateConsensus(min_reads=self.vote_min_reads, threshold=self.vote_threshold)
+                track = Track(next(self._ids), box, self.frame_idx, votes)
+                self.tracks[track.track_id] = track
+                self.tracks_created += 1
+                assigned[det_idx] = track
+            else:
+                track.box = box
+                track.last_seen = self.frame_idx
+                track.hits += 1
+
+        # 4. Evict tracks that have not been seen for too long. No more reads will come,
+        # so their vote is decided with the reads collected so far; a vote below the
+        # threshold stays undecided and the plate is not reported.
+        expired = [tid for tid, t in self.tracks.items() if self.frame_idx - t.last_seen > self.max_age]
+        for track_id in expired:
+            track = self.tracks.pop(track_id)
+            track.votes.finalize(min_confidence=self.vote_threshold)
+            self.finished.append(track)
+        self.tracks_evicted += len(expired)
+
+        return assigned
+
+    def pop_finished(self) -> list[Track]:
+        """
+        Returns the tracks evicted since the last call, with their OCR vote finalized
+        (a vote below `vote_threshold` is left with no final text).
+
+        Returns:
+            list[Track]: The finished tracks, including ones that were already reported.
+        """
+        finished, self.finished = self.finished, []
+        return finished
+
+    def flush(self) -> list[Track]:
+        """
+        Ends every live track, e.g. at the end of a stream, and returns all finished tracks.
+
+        Returns:
+            list[Track]: The tracks evicted earlier and not yet collected, then the live tracks,
+                         all with their OCR vote finalized.
+        """
+        for track in self.tracks.values():
+            track.votes.finalize(min_confidence=self.vote_threshold)
+            self.finished.append(track)
+        self.tracks.clear()
+        return self.pop_finished()
+
+    def __len__(self) -> int:
+        return len(self.tracks)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# video_writer.py
+#
+# Description:
+# Asynchronous output video writer. `cv2.VideoWriter.write()` encodes the frame
+# (mp4v) before returning, which adds straight to the per-frame latency of the
+# loop. `AsyncVideoWriter` hands frames to a dedicated encode thread through a
+# bounded queue instead. When the encoder falls behind, the queue applies one
+# of two back-pressure policies:
+#   - "block": wait for space, so every frame is saved (the loop slows down to
+#              the encoding speed only when the queue is full).
+#   - "drop":  drop the new frame and count it, so detection FPS never suffers.
+# If encoding fails, the error is kept and every later frame is dropped: the
+# loop never blocks on a queue that nobody drains.
+#
+
+# --- Standard Library Imports ---
+from __future__ import annotations
+import queue
+import threading
+
+# --- Third-Party Library Imports ---
+import cv2
+
+# --- Constants ---
+WRITER_POLICIES = ("block", "drop")
+
+
+class AsyncVideoWriter:
+    """
+    Wraps a `cv2.VideoWriter` with a background encode thread. It exposes the
+    same `write()`, `isOpened()` and `release()` methods, so it can be used as
+    a drop-in replacement in the main loop.
+    """
+
+    def __init__(self, writer: cv2.VideoWriter, policy: str = "block", max_queue: int = 32):
+        """
+        Args:
+            writer (cv2.VideoWriter): An opened video writer.
+            policy (str): "block" (never drop frames) or "drop" (never block the loop).
+            max_queue (int): Maximum number of frames waiting to be encoded.
+        """
+        if policy not in WRITER_POLICIES:
+            raise ValueError(f"Unknown writer policy '{policy}'. Choose from {WRITER_POLICIES}.")
+        self.writer = writer
+        self.policy = policy
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_queue)))
+        self._thread = threading.Thread(target=self._encoder, name="AsyncVideoWriter", daemon=True)
+        self._released = False
+        self.error: Exception | None = None  # Set if the encode thread failed.
+
+        # Counters, read by the stats/metrics code.
+        self.frames_written = 0
+        self.frames_dropped = 0
+
+    def start(self) -> "AsyncVideoWriter":
+        """Starts the encode thread and returns self for chaining."""
+        self._thread.start()
+        return self
+
+    def isOpened(self) -> bool:
+        return self.writer.isOpened()
+
+    def write(self, frame) -> None:
+        """
+        Queues a frame for encoding. The frame must not be modified afterwards.
+        Once the encode thread has failed, frames are dropped instead.
+        """
+        if self._released:
+            return
+        if not self._thread.is_alive():
+            self.frames_dropped += 1
+            return
+        if self.policy == "block":
+            if not self._put(frame):
+                self.frames_dropped += 1
+            return
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            self.frames_dropped += 1
+
+    def release(self) -> None:
+        """Encodes every queued frame, then releases the underlying writer."""
+        if self._released:
+            return
+        self._released = True
+        # Sentinel: everything before it is flushed first.
+        if self._put(None):
+            self._thread.join()
+        self.writer.release()
+
+    def _put(self, item) -> bool:
+        """Waits for queue space while the encode thread is alive. Returns False if it is not."""
+        while self._thread.is_alive():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of frames waiting to be encoded."""
+        return self._queue.qsize()
+
+    # --- Encode thread ---
+    def _encoder(self) -> None:
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            try:
+                self.writer.write(frame)
+            except Exception as e:
+                self.error = e
+                print(f"[ERROR] Output video encoding failed; further frames are dropped. Details: {e}")
+                return
+            self.frames_written += 1
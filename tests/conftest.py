@@ -0,0 +1,12 @@
+# conftest.py
+#
+# Description:
+# Makes the flat modules of src/ importable by the tests, as when running the
+# scripts from inside src/.
+#
+
+# --- Standard Library Imports ---
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
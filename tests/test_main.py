@@ -0,0 +1,80 @@
+# test_main.py
+#
+# Description:
+# Smoke tests of the reporting path of main.py with stub models: detections and
+# OCR texts are given directly, so no weights are needed.
+#
+# How to Run:
+#   python -m pytest -q tests
+#
+
+# --- Standard Library Imports ---
+import importlib.util
+import sys
+import types
+
+# --- Third-Party Library Imports ---
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+if importlib.util.find_spec("fast_plate_ocr") is None:
+    # main.py only imports the recognizer class; these tests never call OCR.
+    stub = types.ModuleType("fast_plate_ocr")
+    stub.ONNXPlateRecognizer = None
+    sys.modules["fast_plate_ocr"] = stub
+
+# --- Local Module Imports ---
+import main
+from batching import Detections
+from tracker import PlateTracker
+
+BOX = (10.0, 10.0, 110.0, 40.0)
+
+
+def make_detections(*boxes) -> Detections:
+    return Detections(np.array(boxes, dtype=np.float32).reshape(-1, 4), np.full(len(boxes), 0.9, dtype=np.float32))
+
+
+def test_process_frame_reports_final_plate_once():
+    tracker = PlateTracker(vote_min_reads=1)
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    detections = make_detections(BOX)
+
+    tracks = tracker.update(detections.xyxy)
+    tracks[0].votes.add("B1234XY")
+    reported = main.process_frame(frame, detections, tracks, ["B1234XY"], log=False)
+
+    assert [(track.votes.final, score) for track, score in reported] == [("B1234XY", pytest.approx(0.9))]
+    track = reported[0][0]
+    assert track.category == "Genap"
+    assert track.city == main.region_index.lookup("B1234XY")
+    assert frame.any()  # Box and labels were drawn.
+
+    tracks = tracker.update(detections.xyxy)
+    assert main.process_frame(frame, detections, tracks, ["B1234XY"], log=False, draw=False) == []
+
+
+def test_report_finished_reports_unreported_tracks():
+    tracker = PlateTracker(vote_min_reads=3)
+    detections = make_detections(BOX)
+
+    tracks = tracker.update(detections.xyxy)
+    tracks[0].votes.add("B1235XY")
+    main.process_frame(None, detections, tracks, ["B1235XY"], log=False, draw=False)
+    assert tracks[0].votes.final is None
+
+    reported = main.report_finished(tracker.flush(), log=False)
+    assert [track.votes.final for track, _ in reported] == ["B1235XY"]
+    assert reported[0][0].category == "Ganjil"
+    assert main.report_finished([reported[0][0]], log=False) == []
+
+
+def test_report_finished_drops_tracks_below_threshold():
+    tracker = PlateTracker(vote_min_reads=5, vote_threshold=0.6)
+    track = tracker.update(make_detections(BOX).xyxy)[0]
+    for text in ("B1234XY", "D5678AB", "F9012CD"):
+        track.votes.add(text)
+
+    assert main.report_finished(tracker.flush(), log=False) == []
+    assert not track.reported
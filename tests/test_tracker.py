@@ -0,0 +1,53 @@
+# test_tracker.py
+#
+# Description:
+# Tests of how finished tracks settle their OCR vote (tracker.py, consensus.py).
+#
+# How to Run:
+#   python -m pytest -q tests
+#
+
+# --- Local Module Imports ---
+from consensus import PlateConsensus
+from tracker import PlateTracker
+
+BOX = (10.0, 10.0, 110.0, 40.0)
+
+
+def evict(tracker: PlateTracker, *reads: str):
+    track = tracker.update([BOX])[0]
+    for text in reads:
+        track.votes.add(text)
+    for _ in range(tracker.max_age + 1):
+        tracker.update([])
+    finished = tracker.pop_finished()
+    assert finished == [track]
+    return track
+
+
+def test_eviction_waives_min_reads():
+    track = evict(PlateTracker(max_age=2, vote_min_reads=3, vote_threshold=0.6), "B1234XY", "B1234XY")
+    assert track.votes.final == "B1234XY"
+
+
+def test_eviction_keeps_threshold():
+    track = evict(PlateTracker(max_age=2, vote_min_reads=5, vote_threshold=0.6), "B1234XY", "D5678AB", "F9012CD")
+    assert track.votes.confidence < 0.6
+    assert track.votes.final is None
+
+
+def test_flush_keeps_threshold():
+    tracker = PlateTracker(vote_min_reads=5, vote_threshold=0.6)
+    agreed, conflicting = tracker.update([BOX, (300.0, 10.0, 400.0, 40.0)])
+    agreed.votes.add("B1234XY")
+    for text in ("B1234XY", "D5678AB", "F9012CD"):
+        conflicting.votes.add(text)
+    assert [t.votes.final for t in tracker.flush()] == ["B1234XY", None]
+
+
+def test_finalize_forces_by_default():
+    votes = PlateConsensus(min_reads=5, threshold=0.6)
+    for text in ("B1234XY", "D5678AB", "F9012CD"):
+        votes.add(text)
+    assert votes.finalize(min_confidence=0.6) is None
+    assert votes.finalize() is not None